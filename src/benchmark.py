@@ -0,0 +1,338 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from board import Board
+from numpy_board import NumpyBoard, np
+from save_manager import SaveManager
+from sqlite_save_manager import SqliteSaveManager
+from journal_save_manager import JournaledSaveManager
+
+BOARD_SIZES = {
+    "Easy": (9, 9),
+    "Medium": (16, 16),
+    "Hard": (30, 16),
+    "200x200": (200, 200),
+    "1000x1000": (1000, 1000)
+}
+DENSITIES = (0.05, 0.12, 0.2)
+HISTORY_LENGTHS = (0, 1000, 10000, 100000)
+QUICK_SIZES = ("Easy", "Medium", "Hard", "200x200")
+QUICK_HISTORY_LENGTHS = (0, 1000, 10000)
+
+ENGINES = {"grid": Board}
+if np is not None:
+    ENGINES["numpy"] = NumpyBoard
+
+# Headless entry points whose cold start should stay cheap; "python" is the interpreter alone
+STARTUP_TARGETS = {
+    "python": "pass",
+    "board": "import board",
+    "game_manager": "import game_manager",
+    "save_manager": "import save_manager",
+    "cli": "import cli"
+}
+
+SAVE_BACKENDS = {
+    "json": SaveManager,
+    "journal": JournaledSaveManager,
+    "sqlite": SqliteSaveManager
+}
+
+
+def legacy_reveal_cell(board, x, y):
+    """The original recursive reveal, kept only as a baseline for comparison"""
+    cell = board.grid[x][y]
+    if cell.is_flagged or cell.is_revealed:
+        return
+
+    cell.is_revealed = True
+
+    if cell.is_mine:
+        board.game_over = True
+        return
+
+    if cell.adjacent_mines == 0:
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                new_x, new_y = x + dx, y + dy
+                if (0 <= new_x < board.width and
+                        0 <= new_y < board.height and
+                        not board.grid[new_x][new_y].is_revealed):
+                    legacy_reveal_cell(board, new_x, new_y)
+
+
+def make_open_board(width, height):
+    """A board without mines, so a single click opens every cell"""
+    board = Board(width, height, 0)
+    board.first_move = False
+    return board
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def measure(func, setup=None, min_time=0.2, max_repeat=20):
+    """Median time of func(setup()) over several runs, plus peak traced memory of one run.
+
+    setup is excluded from both numbers, so each run can start from fresh state.
+    """
+    times = []
+    total = 0.0
+    while len(times) < max_repeat and (total < min_time or len(times) < 3):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        func(argument)
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+        if elapsed > min_time:
+            break
+
+    argument = setup() if setup else None
+    tracemalloc.start()
+    func(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"time": statistics.median(times), "runs": len(times), "peak_memory": peak}
+
+
+def bench_reveal(sizes=((30, 16), (100, 100), (300, 300), (1000, 1000))):
+    results = []
+    for width, height in sizes:
+        board = make_open_board(width, height)
+        elapsed, opened = time_call(board.reveal_cell, 0, 0)
+        row = {"size": f"{width}x{height}", "iterative": elapsed, "opened": len(opened)}
+
+        board = make_open_board(width, height)
+        try:
+            row["recursive"], _ = time_call(legacy_reveal_cell, board, 0, 0)
+        except RecursionError:
+            row["recursive"] = None
+        results.append(row)
+    return results
+
+
+def print_reveal_results(results):
+    print(f"{'size':>10} {'opened':>9} {'iterative':>11} {'recursive':>11}")
+    for row in results:
+        recursive = "RecursionError" if row["recursive"] is None else f"{row['recursive'] * 1000:.1f}ms"
+        print(f"{row['size']:>10} {row['opened']:>9} {row['iterative'] * 1000:>9.1f}ms {recursive:>11}")
+
+
+def bench_board(sizes, densities=DENSITIES, engines=ENGINES):
+    results = []
+    for size_name in sizes:
+        width, height = BOARD_SIZES[size_name]
+        center = (width // 2, height // 2)
+        for density in densities:
+            mines = min(int(width * height * density), width * height - 9)
+            for engine_name, engine in engines.items():
+                params = {"size": size_name, "density": density, "engine": engine_name}
+
+                def new_board(_=None):
+                    return engine(width, height, mines)
+
+                def placed_board():
+                    board = new_board()
+                    board.place_mines(*center, seed=1)
+                    board.first_move = False
+                    return board
+
+                operations = {
+                    "create_board": (new_board, None),
+                    "place_mines": (lambda board: board.place_mines(*center, seed=1), new_board),
+                    "reveal_cell": (lambda board: board.reveal_cell(*center), placed_board),
+                    "check_win": (lambda board: board.check_win(), placed_board),
+                    "completion": (lambda board: board.get_completion_percentage(), placed_board)
+                }
+                for operation, (func, setup) in operations.items():
+                    row = {"operation": operation, **params, **measure(func, setup)}
+                    results.append(row)
+                    print_row(row)
+    return results
+
+
+def write_history(save_file, games):
+    """A save file with `games` games, a grid per ten games and a score per game"""
+    width, height, mines = 30, 16, 99
+    data = {"games": [], "grids": {}, "scores": {}}
+    difficulties = ("Easy", "Medium", "Hard")
+    for index in range(games):
+        grid_id = f"{index // 10:032x}"
+        difficulty = difficulties[index % 3]
+        timestamp = datetime(2024, 1, 1).isoformat()
+        if grid_id not in data["grids"]:
+            data["grids"][grid_id] = {
+                "difficulty": difficulty, "width": width, "height": height, "mines": mines,
+                "seed": index, "first_cell": [0, 0], "created_at": timestamp
+            }
+        data["games"].append({
+            "grid_id": grid_id, "difficulty": difficulty, "width": width, "height": height,
+            "mines": mines, "timestamp": timestamp, "time_elapsed": 1.0,
+            "grid": {"format": 3, "seed": index, "first_cell": [0, 0], "moves": [[0, 0, 0]]}
+        })
+        data["scores"].setdefault(grid_id, []).append({
+            "player": f"player{index}", "score": index % 100, "time": float(index % 300),
+            "timestamp": timestamp, "difficulty": difficulty, "grid_id": grid_id
+        })
+    with open(save_file, 'w') as f:
+        json.dump(data, f, indent=4)
+
+
+def bench_persistence(history_lengths, backends=SAVE_BACKENDS):
+    results = []
+    board = Board(30, 16, 99)
+    board.reveal_cell(15, 8)
+    for games in history_lengths:
+        for backend_name, backend in backends.items():
+            with tempfile.TemporaryDirectory() as directory:
+                json_file = os.path.join(directory, "saves.json")
+                write_history(json_file, games)
+                if backend is SqliteSaveManager:
+                    def open_manager():
+                        return SqliteSaveManager(os.path.join(directory, "saves.db"), json_file)
+                else:
+                    def open_manager():
+                        return backend(json_file)
+
+                # The first open of the SQLite backend migrates the JSON history
+                open_time, manager = time_call(open_manager)
+                params = {"history": games, "backend": backend_name}
+                row = {"operation": "first_open", **params, "time": open_time, "runs": 1,
+                       "peak_memory": None}
+                results.append(row)
+                print_row(row)
+
+                grid_id = f"{max(games - 1, 0) // 10:032x}"
+                operations = {
+                    "open_and_read": (lambda _: open_manager().get_scores(difficulty="Hard"), None),
+                    "open_and_list_games": (lambda _: open_manager().get_games_page(0, 10), None),
+                    "save_game": (lambda _: manager.save_game("Hard", board, 1.0, [(15, 8, False)]), None),
+                    "save_score": (lambda _: manager.save_score("Hard", "bench", 50.0, 1.0, grid_id), None),
+                    "get_scores_difficulty": (lambda _: manager.get_scores(difficulty="Hard"), None),
+                    "get_scores_grid": (lambda _: manager.get_scores(grid_id=grid_id), None),
+                    "get_top_scores_difficulty": (lambda _: manager.get_top_scores(difficulty="Hard"), None),
+                    "load_games": (lambda _: manager.load_games(), None),
+                    "get_games_page": (lambda _: manager.get_games_page(0, 10, "Hard"), None)
+                }
+                for operation, (func, setup) in operations.items():
+                    row = {"operation": operation, **params, **measure(func, setup, max_repeat=5)}
+                    results.append(row)
+                    print_row(row)
+                if isinstance(manager, JournaledSaveManager):
+                    manager.wait_for_compaction()
+                if isinstance(manager, SqliteSaveManager):
+                    manager.close()
+    return results
+
+
+def bench_startup(targets=STARTUP_TARGETS, runs=5):
+    """Cold-start time of a fresh interpreter importing each headless module"""
+    results = []
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for target, code in targets.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=directory, check=True)
+            times.append(time.perf_counter() - start)
+        row = {"operation": "startup", "target": target, "time": statistics.median(times),
+               "runs": runs, "peak_memory": None}
+        results.append(row)
+        print_row(row)
+    # The headless core must not drag in the GUI toolkit or numpy
+    check = "import sys, cli; print(sorted({'tkinter', 'numpy'} & set(sys.modules)))"
+    loaded = subprocess.run([sys.executable, "-c", check], cwd=directory,
+                            capture_output=True, text=True, check=True).stdout.strip()
+    print(f"{'heavy modules':>22} {loaded}")
+    return results
+
+
+def print_row(row):
+    params = " ".join(f"{key}={value}" for key, value in row.items()
+                      if key not in ("operation", "time", "runs", "peak_memory"))
+    memory = "" if row["peak_memory"] is None else f" {row['peak_memory'] / 1024:10.1f} KiB"
+    print(f"{row['operation']:>22} {params:<45} {row['time'] * 1000:10.3f} ms{memory}")
+
+
+def result_key(row):
+    return tuple(sorted((key, value) for key, value in row.items()
+                        if key not in ("time", "runs", "peak_memory")))
+
+
+def compare(baseline_file, results):
+    """Print the time ratio of each result against a previous run"""
+    with open(baseline_file, 'r') as f:
+        baseline = {result_key(row): row for row in json.load(f)["results"]}
+    print(f"\ncompared with {baseline_file}:")
+    for row in results:
+        old = baseline.get(result_key(row))
+        if old is None or not old["time"]:
+            continue
+        ratio = row["time"] / old["time"]
+        marker = " slower" if ratio > 1.1 else " faster" if ratio < 0.9 else ""
+        params = " ".join(f"{key}={value}" for key, value in result_key(row) if key != "operation")
+        print(f"{row['operation']:>22} {params:<45} x{ratio:6.2f}{marker}")
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Minesweeper benchmarks")
+    parser.add_argument("--quick", action="store_true",
+                        help="skip 1000x1000 boards and the 100k-game history")
+    parser.add_argument("--suite", choices=("all", "board", "persistence", "reveal", "startup"),
+                        default="all")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file from an earlier commit")
+    args = parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else tuple(BOARD_SIZES)
+    history_lengths = QUICK_HISTORY_LENGTHS if args.quick else HISTORY_LENGTHS
+
+    if args.suite in ("all", "reveal"):
+        print(f"recursion limit: {sys.getrecursionlimit()}")
+        print_reveal_results(bench_reveal())
+
+    results = []
+    if args.suite in ("all", "board"):
+        results += bench_board(sizes)
+    if args.suite in ("all", "persistence"):
+        results += bench_persistence(history_lengths)
+    if args.suite in ("all", "startup"):
+        results += bench_startup()
+
+    if results:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "meta": {
+                    "commit": current_commit(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "timestamp": datetime.now().isoformat()
+                },
+                "results": results
+            }, f, indent=4)
+        print(f"\nwrote {len(results)} results to {args.output}")
+        if args.compare:
+            compare(args.compare, results)
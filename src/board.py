@@ -2,7 +2,94 @@ import random
 from cell import Cell
 
 
-class Board:
+# Move actions in move logs; older logs store an is_flag boolean, which matches REVEAL and FLAG
+REVEAL = 0
+FLAG = 1
+CHORD = 2
+
+
+def new_seed():
+    return random.getrandbits(63)
+
+
+def sample_mine_indices(width, height, first_x, first_y, mines, seed):
+    """Pick mine cells as flat indices (x * height + y) outside the 3x3 area around the first click.
+
+    Floyd's algorithm over the candidate index space draws exactly `mines` values from a
+    private PRNG, so the layout depends only on the seed and costs O(mines).
+    """
+    safe_indices = sorted(x * height + y
+                          for x in range(max(0, first_x - 1), min(width, first_x + 2))
+                          for y in range(max(0, first_y - 1), min(height, first_y + 2)))
+    candidates = width * height - len(safe_indices)
+    if mines > candidates:
+        raise ValueError(f"Cannot place {mines} mines on a {width}x{height} board")
+
+    rng = random.Random(seed)
+    chosen = set()
+    for upper in range(candidates - mines, candidates):
+        pick = rng.randrange(upper + 1)
+        chosen.add(upper if pick in chosen else pick)
+
+    # Map candidate numbers back to cells by skipping over the safe area; candidates come
+    # in ascending order, so the number of safe cells skipped only grows
+    indices = []
+    skipped = 0
+    safe_count = len(safe_indices)
+    for candidate in sorted(chosen):
+        while skipped < safe_count and candidate + skipped >= safe_indices[skipped]:
+            skipped += 1
+        indices.append(candidate + skipped)
+    return indices
+
+
+class BaseBoard:
+    """Rules every bounded engine shares, written against grid, reveal_cell and the counters"""
+
+    def reset_with_same_first_move(self):
+        if self.first_cell is None:
+            return
+
+        first_cell, seed = self.first_cell, self.seed
+        self.reset()
+        self.first_move = False
+
+        # Same seed and first cell rebuild the exact same layout
+        self.place_mines(*first_cell, seed=seed)
+        # Reveal the first cell
+        self.reveal_cell(*first_cell)
+
+    def chord(self, x, y):
+        """Reveal every unflagged neighbour of a number whose mines are all flagged, as one move"""
+        cell = self.grid[x][y]
+        if not cell.is_revealed or cell.is_mine or cell.adjacent_mines == 0:
+            return set()
+        x_start, x_end = max(0, x - 1), min(self.width, x + 2)
+        y_start, y_end = max(0, y - 1), min(self.height, y + 2)
+        flags = sum(self.grid[nx][ny].is_flagged
+                    for nx in range(x_start, x_end) for ny in range(y_start, y_end))
+        if flags != cell.adjacent_mines:
+            return set()
+        # A wrong flag makes this open a mine, exactly as clicking that neighbour would
+        opened = set()
+        for nx in range(x_start, x_end):
+            for ny in range(y_start, y_end):
+                opened |= self.reveal_cell(nx, ny)
+        return opened
+
+    def check_win(self):
+        if self.hidden_safe_cells or self.correct_flags != self.mines:
+            return False
+        self.won = True
+        return True
+
+    def get_completion_percentage(self):
+        total_cells = self.width * self.height
+        revealed_cells = total_cells - self.mines - self.hidden_safe_cells
+        return ((revealed_cells + self.correct_flags) / total_cells) * 100
+
+
+class Board(BaseBoard):
     def __init__(self, width, height, mines):
         self.width = width
         self.height = height
@@ -10,45 +97,92 @@ class Board:
         self.grid = [[Cell(x, y) for y in range(height)] for x in range(width)]
         self.first_move = True
         self.first_cell = None
+        # Seed of the mine layout; with first_cell it identifies the grid
+        self.seed = None
         self.game_over = False
         self.won = False
+        # Running counters so check_win and get_completion_percentage never scan the grid
+        self.hidden_safe_cells = width * height - mines
+        self.correct_flags = 0
+        self.wrong_flags = 0
 
-    def place_mines(self, first_x, first_y):
+    def recount(self):
+        """Rebuild the running counters after cells were changed directly (loads, placement)"""
+        revealed_safe = 0
+        self.correct_flags = 0
+        self.wrong_flags = 0
+        for column in self.grid:
+            for cell in column:
+                if cell.is_mine:
+                    if cell.is_flagged:
+                        self.correct_flags += 1
+                else:
+                    if cell.is_revealed:
+                        revealed_safe += 1
+                    elif cell.is_flagged:
+                        self.wrong_flags += 1
+        self.hidden_safe_cells = self.width * self.height - self.mines - revealed_safe
+
+    def place_mines(self, first_x, first_y, seed=None, indices=None):
+        """Lay out the mines; indices are the seed's sample_mine_indices when already computed"""
         self.first_cell = (first_x, first_y)
-        # Clear area around first click
-        safe_cells = [(x, y) for x in range(max(0, first_x - 1), min(self.width, first_x + 2))
-                      for y in range(max(0, first_y - 1), min(self.height, first_y + 2))]
+        self.seed = seed if seed is not None else new_seed()
 
-        # Place mines randomly
-        possible_positions = [(x, y) for x in range(self.width) for y in range(self.height)
-                              if (x, y) not in safe_cells]
-        mine_positions = random.sample(possible_positions, self.mines)
+        height = self.height
+        if indices is None:
+            indices = sample_mine_indices(self.width, height, first_x, first_y,
+                                          self.mines, self.seed)
+        for index in indices:
+            self.grid[index // height][index % height].is_mine = True
 
-        for x, y in mine_positions:
-            self.grid[x][y].is_mine = True
+        self.compute_adjacency()
+        self.recount()
 
-        # Calculate adjacent mines
-        for x in range(self.width):
-            for y in range(self.height):
-                if not self.grid[x][y].is_mine:
-                    self.grid[x][y].adjacent_mines = self.count_adjacent_mines(x, y)
+    def compute_adjacency(self):
+        # Calculate adjacent mines by bumping the neighbours of each mine: O(cells + 8 * mines)
+        grid = self.grid
+        width, height = self.width, self.height
+        mine_cells = []
+        for column in grid:
+            for cell in column:
+                cell.adjacent_mines = 0
+                if cell.is_mine:
+                    mine_cells.append(cell)
+        for mine in mine_cells:
+            for nx in range(max(0, mine.x - 1), min(width, mine.x + 2)):
+                column = grid[nx]
+                for ny in range(max(0, mine.y - 1), min(height, mine.y + 2)):
+                    column[ny].adjacent_mines += 1
+        for cell in mine_cells:
+            cell.adjacent_mines = 0
 
-    def reset_with_same_first_move(self):
-        if self.first_cell is None:
-            return
+    def mine_indices(self):
+        """Flat indices (x * height + y) of the mines, in ascending order"""
+        return [index for index, is_mine in enumerate(self.cell_flags("is_mine")) if is_mine]
 
-        for x in range(self.width):
-            for y in range(self.height):
-                self.grid[x][y].reset()
+    def cell_flags(self, name):
+        """One cell attribute (is_mine, is_revealed, is_flagged) for every cell, column by column"""
+        return [getattr(cell, name) for column in self.grid for cell in column]
 
+    def set_cell_flags(self, name, values):
+        cells = (cell for column in self.grid for cell in column)
+        for cell, value in zip(cells, values):
+            setattr(cell, name, value)
+
+    def reset(self):
+        """Clear the board for a new game, reusing its cells"""
+        for column in self.grid:
+            for cell in column:
+                cell.reset()
+
+        self.first_move = True
+        self.first_cell = None
+        self.seed = None
         self.game_over = False
         self.won = False
-        self.first_move = False
-
-        # Place mines keeping the same first cell
-        self.place_mines(*self.first_cell)
-        # Reveal the first cell
-        self.reveal_cell(*self.first_cell)
+        self.hidden_safe_cells = self.width * self.height - self.mines
+        self.correct_flags = 0
+        self.wrong_flags = 0
 
     def count_adjacent_mines(self, x, y):
         count = 0
@@ -64,56 +198,75 @@ class Board:
         return count
 
     def reveal_cell(self, x, y):
+        """Reveal a cell and flood-fill empty areas, returning the opened cells"""
         if self.first_move:
             self.place_mines(x, y)
             self.first_move = False
 
         cell = self.grid[x][y]
         if cell.is_flagged or cell.is_revealed:
-            return
+            return set()
 
         cell.is_revealed = True
+        opened = {(x, y)}
 
         if cell.is_mine:
             self.game_over = True
-            return
+            return opened
+
+        self.hidden_safe_cells -= 1
 
         if cell.adjacent_mines == 0:
-            self.reveal_adjacent_cells(x, y)
+            opened |= self.reveal_adjacent_cells(x, y)
+        return opened
 
     def reveal_adjacent_cells(self, x, y):
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                new_x, new_y = x + dx, y + dy
-                if (0 <= new_x < self.width and
-                        0 <= new_y < self.height and
-                        not self.grid[new_x][new_y].is_revealed):
-                    self.reveal_cell(new_x, new_y)
+        # Iterative flood fill: a stack of zero cells instead of one Python frame per cell
+        opened = []
+        grid = self.grid
+        width, height = self.width, self.height
+        stack = [(x, y)]
+        while stack:
+            cx, cy = stack.pop()
+            x_start = cx - 1 if cx > 0 else 0
+            x_end = cx + 2 if cx + 2 < width else width
+            y_start = cy - 1 if cy > 0 else 0
+            y_end = cy + 2 if cy + 2 < height else height
+            for nx in range(x_start, x_end):
+                column = grid[nx]
+                for ny in range(y_start, y_end):
+                    cell = column[ny]
+                    if cell.is_revealed or cell.is_flagged:
+                        continue
+                    cell.is_revealed = True
+                    opened.append((nx, ny))
+                    if cell.is_mine:
+                        self.game_over = True
+                        continue
+                    self.hidden_safe_cells -= 1
+                    if cell.adjacent_mines == 0:
+                        stack.append((nx, ny))
+        return set(opened)
 
     def toggle_flag(self, x, y):
+        """Flag or unflag a hidden cell, returning the cells that changed"""
         cell = self.grid[x][y]
-        if not cell.is_revealed:
-            cell.is_flagged = not cell.is_flagged
-
-    def check_win(self):
-        for x in range(self.width):
-            for y in range(self.height):
-                cell = self.grid[x][y]
-                if cell.is_mine and not cell.is_flagged:
-                    return False
-                if not cell.is_mine and not cell.is_revealed:
-                    return False
-        self.won = True
-        return True
+        if cell.is_revealed:
+            return set()
+        cell.is_flagged = not cell.is_flagged
+        step = 1 if cell.is_flagged else -1
+        if cell.is_mine:
+            self.correct_flags += step
+        else:
+            self.wrong_flags += step
+        return {(x, y)}
 
-    def get_completion_percentage(self):
-        total_cells = self.width * self.height
-        revealed_cells = sum(1 for x in range(self.width)
-                             for y in range(self.height)
-                             if self.grid[x][y].is_revealed and not self.grid[x][y].is_mine)
-        correct_flags = sum(1 for x in range(self.width)
-                            for y in range(self.height)
-                            if self.grid[x][y].is_flagged and self.grid[x][y].is_mine)
-        return ((revealed_cells + correct_flags) / total_cells) * 100
\ No newline at end of file
+    def reveal_mines(self):
+        """Show every mine after a loss, returning their cells"""
+        mines = []
+        for column in self.grid:
+            for cell in column:
+                if cell.is_mine:
+                    cell.is_revealed = True
+                    mines.append((cell.x, cell.y))
+        return mines
@@ -0,0 +1,198 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Event.state bits of a mouse button already held when another one is pressed
+LEFT_BUTTON_MASK = 0x0100
+RIGHT_BUTTON_MASK = 0x0400
+
+
+class CanvasBoardView:
+    """Draws a board on a single Canvas, creating items only for the cells in the viewport"""
+
+    MIN_CELL_SIZE = 8
+    MAX_CELL_SIZE = 48
+
+    def __init__(self, parent, game_manager, on_click, on_right_click,
+                 cell_size=24, max_view=(760, 480), on_chord=None):
+        self.game_manager = game_manager
+        self.on_click = on_click
+        self.on_right_click = on_right_click
+        self.on_chord = on_chord
+        self.cell_size = cell_size
+        self.max_view = max_view
+        # (x, y) -> (rectangle id, text id) for the cells currently on the canvas
+        self.items = {}
+        self.redraw_pending = False
+
+        self.frame = tk.Frame(parent, bg='#2C3E50')
+        self.canvas = tk.Canvas(self.frame, bg='#2C3E50', highlightthickness=0)
+        self.x_scrollbar = ttk.Scrollbar(self.frame, orient="horizontal", command=self.canvas.xview)
+        self.y_scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+        # Every view change (scrollbar, wheel, resize) goes through these callbacks
+        self.canvas.configure(
+            xscrollcommand=lambda *args: self.on_view_changed(self.x_scrollbar, args),
+            yscrollcommand=lambda *args: self.on_view_changed(self.y_scrollbar, args)
+        )
+
+        self.canvas.grid(row=0, column=0, sticky='nsew')
+        self.y_scrollbar.grid(row=0, column=1, sticky='ns')
+        self.x_scrollbar.grid(row=1, column=0, sticky='ew')
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind('<Button-1>', lambda e: self.dispatch(e, self.on_click, RIGHT_BUTTON_MASK))
+        self.canvas.bind('<Button-2>', lambda e: self.dispatch(e, self.on_chord))
+        self.canvas.bind('<Button-3>', lambda e: self.dispatch(e, self.on_right_click, LEFT_BUTTON_MASK))
+        self.canvas.bind('<Configure>', lambda e: self.schedule_redraw())
+        self.canvas.bind('<MouseWheel>', self.on_mousewheel)
+        self.canvas.bind('<Shift-MouseWheel>', self.on_mousewheel)
+        self.canvas.bind('<Control-MouseWheel>', self.on_zoom)
+        self.canvas.bind('<Button-4>', lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind('<Button-5>', lambda e: self.canvas.yview_scroll(1, "units"))
+        self.canvas.bind('<Control-Button-4>', lambda e: self.zoom(1))
+        self.canvas.bind('<Control-Button-5>', lambda e: self.zoom(-1))
+
+        self.resize()
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def resize(self):
+        size = self.cell_size
+        width = self.game_manager.width * size
+        height = self.game_manager.height * size
+        self.canvas.configure(
+            width=min(width, self.max_view[0]),
+            height=min(height, self.max_view[1]),
+            scrollregion=(0, 0, width, height),
+            xscrollincrement=size,
+            yscrollincrement=size
+        )
+        self.canvas.delete("all")
+        self.items = {}
+        self.schedule_redraw()
+
+    def cell_at(self, event):
+        x = int(self.canvas.canvasx(event.x) // self.cell_size)
+        y = int(self.canvas.canvasy(event.y) // self.cell_size)
+        if 0 <= x < self.game_manager.width and 0 <= y < self.game_manager.height:
+            return x, y
+        return None
+
+    def dispatch(self, event, handler, chord_mask=0):
+        cell = self.cell_at(event)
+        if cell is None:
+            return
+        # Pressing both buttons chords, like the middle button
+        if event.state & chord_mask:
+            handler = self.on_chord
+        if handler is not None:
+            handler(*cell)
+
+    def on_view_changed(self, scrollbar, args):
+        scrollbar.set(*args)
+        self.schedule_redraw()
+
+    def on_mousewheel(self, event):
+        steps = int(-1 * (event.delta / 120)) or (-1 if event.delta > 0 else 1)
+        if event.state & 0x0001:  # Shift scrolls horizontally
+            self.canvas.xview_scroll(steps, "units")
+        else:
+            self.canvas.yview_scroll(steps, "units")
+
+    def on_zoom(self, event):
+        self.zoom(1 if event.delta > 0 else -1)
+
+    def zoom(self, direction):
+        new_size = self.cell_size + 4 * direction
+        new_size = max(self.MIN_CELL_SIZE, min(self.MAX_CELL_SIZE, new_size))
+        if new_size == self.cell_size:
+            return
+        # Keep the same cell in the top-left corner after zooming
+        left = self.canvas.canvasx(0) / self.cell_size
+        top = self.canvas.canvasy(0) / self.cell_size
+        self.cell_size = new_size
+        self.resize()
+        self.canvas.xview_moveto(left / self.game_manager.width)
+        self.canvas.yview_moveto(top / self.game_manager.height)
+
+    def schedule_redraw(self):
+        # Scrolling fires many callbacks in a row; coalesce them into one redraw
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.canvas.after_idle(self.draw_viewport)
+
+    def visible_range(self):
+        size = self.cell_size
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        view_width = self.canvas.winfo_width() or int(self.canvas.cget('width'))
+        view_height = self.canvas.winfo_height() or int(self.canvas.cget('height'))
+        x_start = max(0, int(left // size))
+        y_start = max(0, int(top // size))
+        x_end = min(self.game_manager.width, int((left + view_width) // size) + 1)
+        y_end = min(self.game_manager.height, int((top + view_height) // size) + 1)
+        return x_start, x_end, y_start, y_end
+
+    def draw_viewport(self):
+        self.redraw_pending = False
+        x_start, x_end, y_start, y_end = self.visible_range()
+
+        # Drop items that scrolled out of view so the item count stays bounded
+        for (x, y) in list(self.items):
+            if not (x_start <= x < x_end and y_start <= y < y_end):
+                rect, text = self.items.pop((x, y))
+                self.canvas.delete(rect, text)
+
+        size = self.cell_size
+        for x in range(x_start, x_end):
+            for y in range(y_start, y_end):
+                if (x, y) in self.items:
+                    continue
+                rect = self.canvas.create_rectangle(
+                    x * size + 1, y * size + 1, (x + 1) * size - 1, (y + 1) * size - 1,
+                    outline='#7F8C8D'
+                )
+                text = self.canvas.create_text(
+                    x * size + size / 2, y * size + size / 2,
+                    font=('Helvetica', max(6, size // 2), 'bold')
+                )
+                self.items[(x, y)] = (rect, text)
+                self.draw_cell(x, y)
+
+    def draw_cell(self, x, y):
+        cell = self.game_manager.board.grid[x][y]
+        rect, text = self.items[(x, y)]
+
+        if cell.is_revealed:
+            if cell.is_mine:
+                self.canvas.itemconfig(rect, fill="red")
+                self.canvas.itemconfig(text, text="💣", fill='#000000')
+            elif cell.adjacent_mines > 0:
+                self.canvas.itemconfig(rect, fill='#ECF0F1')
+                self.canvas.itemconfig(text, text=str(cell.adjacent_mines), fill=cell.get_color())
+            else:
+                self.canvas.itemconfig(rect, fill='#ECF0F1')
+                self.canvas.itemconfig(text, text="")
+        elif cell.is_flagged:
+            self.canvas.itemconfig(rect, fill='#BDC3C7')
+            self.canvas.itemconfig(text, text="🚩", fill='#E74C3C')
+        else:
+            self.canvas.itemconfig(rect, fill='#95A5A6')
+            self.canvas.itemconfig(text, text="")
+
+    def highlight(self, x, y, color):
+        if (x, y) in self.items:
+            self.canvas.itemconfig(self.items[(x, y)][0], fill=color)
+
+    def refresh(self, cells=None):
+        """Redraw the given cells, or every visible cell when cells is None"""
+        if cells is None:
+            cells = list(self.items)
+        for x, y in cells:
+            # Off-screen cells are drawn from board state when they scroll into view
+            if (x, y) in self.items:
+                self.draw_cell(x, y)
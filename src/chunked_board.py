@@ -0,0 +1,352 @@
+from array import array
+from bisect import bisect_left
+from board import BaseBoard, new_seed, sample_mine_indices
+from cell import Cell
+
+# Chunks are CHUNK_SIZE x CHUNK_SIZE cells; a power of two so cells map to chunks by shifting
+CHUNK_BITS = 5
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+# Offset steps to the eight neighbours of a cell that is not on its chunk's edge
+INNER_NEIGHBOURS = tuple((dx << CHUNK_BITS) + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+
+
+class Chunk:
+    """Packed state of one square of cells, one byte per cell, indexed (x % size) * size + y % size"""
+
+    __slots__ = ("mines", "revealed", "flagged", "adjacent")
+
+    def __init__(self):
+        cells = CHUNK_SIZE * CHUNK_SIZE
+        self.mines = bytearray(cells)
+        self.revealed = bytearray(cells)
+        self.flagged = bytearray(cells)
+        self.adjacent = bytearray(cells)
+
+
+class ChunkedCell(Cell):
+    """Cell view over a ChunkedBoard; reading a hidden cell of an untouched chunk creates nothing"""
+
+    def __init__(self, board, x, y):
+        self.board = board
+        self.x = x
+        self.y = y
+
+    def chunk(self, create):
+        return self.board.chunk_at(self.x, self.y, create)
+
+    def offset(self):
+        return ((self.x & CHUNK_MASK) << CHUNK_BITS) | (self.y & CHUNK_MASK)
+
+    @property
+    def is_mine(self):
+        chunk = self.chunk(False)
+        if chunk is None:
+            return self.board.has_mine(self.x, self.y)
+        return bool(chunk.mines[self.offset()])
+
+    @is_mine.setter
+    def is_mine(self, value):
+        self.board.set_mine(self.x, self.y, value)
+
+    @property
+    def is_revealed(self):
+        chunk = self.chunk(False)
+        if chunk is not None and chunk.revealed[self.offset()]:
+            return True
+        # After a loss every mine shows, without materializing the chunks that hold them
+        return self.board.mines_shown and self.is_mine
+
+    @is_revealed.setter
+    def is_revealed(self, value):
+        self.chunk(True).revealed[self.offset()] = value
+
+    @property
+    def is_flagged(self):
+        chunk = self.chunk(False)
+        return chunk is not None and bool(chunk.flagged[self.offset()])
+
+    @is_flagged.setter
+    def is_flagged(self, value):
+        self.chunk(True).flagged[self.offset()] = value
+
+    @property
+    def adjacent_mines(self):
+        return self.chunk(True).adjacent[self.offset()]
+
+    @adjacent_mines.setter
+    def adjacent_mines(self, value):
+        self.chunk(True).adjacent[self.offset()] = value
+
+
+class ChunkedColumn:
+    def __init__(self, board, x):
+        self.board = board
+        self.x = x
+
+    def __getitem__(self, y):
+        return ChunkedCell(self.board, self.x, y)
+
+    def __len__(self):
+        return self.board.height
+
+    def __iter__(self):
+        return (ChunkedCell(self.board, self.x, y) for y in range(self.board.height))
+
+
+class ChunkedGrid:
+    """board.grid[x][y] without a Cell per square: views are made on access"""
+
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, x):
+        return ChunkedColumn(self.board, x)
+
+    def __len__(self):
+        return self.board.width
+
+    def __iter__(self):
+        return (ChunkedColumn(self.board, x) for x in range(self.board.width))
+
+
+class ChunkedBoard(BaseBoard):
+    """Board engine for giant custom boards, same API as Board.
+
+    The layout is kept as a sorted array of flat mine indices; per-cell state lives in
+    chunks that are created the first time a cell in them is revealed, flagged or asked
+    for its mine count. Memory grows with the explored area, not with the board.
+    """
+
+    def __init__(self, width, height, mines):
+        self.width = width
+        self.height = height
+        self.mines = mines
+        # Sorted flat mine indices (x * height + y), as sample_mine_indices gives them
+        self.layout = array('q')
+        self.chunks = {}
+        self.grid = ChunkedGrid(self)
+        self.mines_shown = False
+        self.first_move = True
+        self.first_cell = None
+        # Seed of the mine layout; with first_cell it identifies the grid
+        self.seed = None
+        self.game_over = False
+        self.won = False
+        self.hidden_safe_cells = width * height - mines
+        self.correct_flags = 0
+        self.wrong_flags = 0
+
+    def has_mine(self, x, y):
+        index = x * self.height + y
+        position = bisect_left(self.layout, index)
+        return position < len(self.layout) and self.layout[position] == index
+
+    def mines_in_columns(self, x_start, x_end, y_start, y_end):
+        """(x, y) of every mine in the given rectangle, found by bisecting each column"""
+        height = self.height
+        layout = self.layout
+        for x in range(x_start, x_end):
+            base = x * height
+            position = bisect_left(layout, base + y_start)
+            end = base + y_end
+            while position < len(layout) and layout[position] < end:
+                yield x, layout[position] - base
+                position += 1
+
+    def chunk_at(self, x, y, create=True):
+        key = (x >> CHUNK_BITS, y >> CHUNK_BITS)
+        chunk = self.chunks.get(key)
+        if chunk is None and create:
+            chunk = self.chunks[key] = self.build_chunk(*key)
+        return chunk
+
+    def build_chunk(self, cx, cy):
+        chunk = Chunk()
+        x0, y0 = cx << CHUNK_BITS, cy << CHUNK_BITS
+        x1, y1 = min(self.width, x0 + CHUNK_SIZE), min(self.height, y0 + CHUNK_SIZE)
+        mines, adjacent = chunk.mines, chunk.adjacent
+        # Mines on the one-cell border count towards the chunk's edge cells too
+        for x, y in self.mines_in_columns(max(0, x0 - 1), min(self.width, x1 + 1),
+                                          max(0, y0 - 1), min(self.height, y1 + 1)):
+            for nx in range(max(x0, x - 1), min(x1, x + 2)):
+                row = (nx - x0) << CHUNK_BITS
+                for ny in range(max(y0, y - 1), min(y1, y + 2)):
+                    adjacent[row | (ny - y0)] += 1
+            if x0 <= x < x1 and y0 <= y < y1:
+                mines[((x - x0) << CHUNK_BITS) | (y - y0)] = 1
+        # A mine counted itself above; mines carry no number
+        for offset, is_mine in enumerate(mines):
+            if is_mine:
+                adjacent[offset] = 0
+        return chunk
+
+    def set_mine(self, x, y, value):
+        """Change one cell's mine flag; only for loads that list mine positions"""
+        index = x * self.height + y
+        position = bisect_left(self.layout, index)
+        present = position < len(self.layout) and self.layout[position] == index
+        if value and not present:
+            self.layout.insert(position, index)
+        elif not value and present:
+            del self.layout[position]
+        # Counts around the cell are stale until compute_adjacency
+        chunk = self.chunk_at(x, y, False)
+        if chunk is not None:
+            chunk.mines[((x & CHUNK_MASK) << CHUNK_BITS) | (y & CHUNK_MASK)] = bool(value)
+
+    def recount(self):
+        """Rebuild the running counters after cells were changed directly (loads, placement)"""
+        revealed_safe = 0
+        self.correct_flags = 0
+        self.wrong_flags = 0
+        for chunk in self.chunks.values():
+            for mine, revealed, flagged in zip(chunk.mines, chunk.revealed, chunk.flagged):
+                if mine:
+                    if flagged:
+                        self.correct_flags += 1
+                elif revealed:
+                    revealed_safe += 1
+                elif flagged:
+                    self.wrong_flags += 1
+        self.hidden_safe_cells = self.width * self.height - self.mines - revealed_safe
+
+    def place_mines(self, first_x, first_y, seed=None, indices=None):
+        self.first_cell = (first_x, first_y)
+        self.seed = seed if seed is not None else new_seed()
+        if indices is None:
+            indices = sample_mine_indices(self.width, self.height, first_x, first_y,
+                                          self.mines, self.seed)
+        self.layout = array('q', indices)
+        self.compute_adjacency()
+        self.recount()
+
+    def compute_adjacency(self):
+        # Chunks keep their revealed and flagged bytes; mines and counts are rebuilt from the layout
+        for key, chunk in self.chunks.items():
+            fresh = self.build_chunk(*key)
+            chunk.mines, chunk.adjacent = fresh.mines, fresh.adjacent
+
+    def mine_indices(self):
+        return self.layout
+
+    def cell_flags(self, name):
+        """One cell attribute (is_mine, is_revealed, is_flagged) for every cell, column by column"""
+        return [getattr(cell, name) for column in self.grid for cell in column]
+
+    def set_cell_flags(self, name, values):
+        cells = (cell for column in self.grid for cell in column)
+        for cell, value in zip(cells, values):
+            setattr(cell, name, value)
+
+    def reset(self):
+        """Clear the board for a new game, dropping every chunk"""
+        self.layout = array('q')
+        self.chunks = {}
+        self.mines_shown = False
+        self.first_move = True
+        self.first_cell = None
+        self.seed = None
+        self.game_over = False
+        self.won = False
+        self.hidden_safe_cells = self.width * self.height - self.mines
+        self.correct_flags = 0
+        self.wrong_flags = 0
+
+    def count_adjacent_mines(self, x, y):
+        count = sum(1 for _ in self.mines_in_columns(max(0, x - 1), min(self.width, x + 2),
+                                                     max(0, y - 1), min(self.height, y + 2)))
+        return count - self.has_mine(x, y)
+
+    def reveal_cell(self, x, y):
+        """Reveal a cell and flood-fill empty areas, returning the opened cells"""
+        if self.first_move:
+            self.place_mines(x, y)
+            self.first_move = False
+
+        chunk = self.chunk_at(x, y)
+        offset = ((x & CHUNK_MASK) << CHUNK_BITS) | (y & CHUNK_MASK)
+        if chunk.flagged[offset] or chunk.revealed[offset]:
+            return set()
+
+        chunk.revealed[offset] = 1
+        opened = {(x, y)}
+
+        if chunk.mines[offset]:
+            self.game_over = True
+            return opened
+
+        self.hidden_safe_cells -= 1
+
+        if chunk.adjacent[offset] == 0:
+            opened |= self.reveal_adjacent_cells(x, y)
+        return opened
+
+    def reveal_adjacent_cells(self, x, y):
+        # Iterative flood fill; cells away from chunk and board edges find their neighbours
+        # by offset arithmetic, edge cells look up the chunk of each neighbour
+        opened = []
+        chunks = self.chunks
+        width, height = self.width, self.height
+        hidden_safe_cells = self.hidden_safe_cells
+        stack = [(x, y)]
+        while stack:
+            cx, cy = stack.pop()
+            lx, ly = cx & CHUNK_MASK, cy & CHUNK_MASK
+            if 0 < lx < CHUNK_MASK and 0 < ly < CHUNK_MASK and cx + 1 < width and cy + 1 < height:
+                chunk = chunks[(cx >> CHUNK_BITS, cy >> CHUNK_BITS)]
+                revealed, flagged = chunk.revealed, chunk.flagged
+                mines, adjacent = chunk.mines, chunk.adjacent
+                centre = (lx << CHUNK_BITS) | ly
+                for delta in INNER_NEIGHBOURS:
+                    offset = centre + delta
+                    if revealed[offset] or flagged[offset]:
+                        continue
+                    revealed[offset] = 1
+                    nx, ny = cx + (offset >> CHUNK_BITS) - lx, cy + (offset & CHUNK_MASK) - ly
+                    opened.append((nx, ny))
+                    if mines[offset]:
+                        self.game_over = True
+                        continue
+                    hidden_safe_cells -= 1
+                    if adjacent[offset] == 0:
+                        stack.append((nx, ny))
+                continue
+            for nx in range(cx - 1 if cx > 0 else 0, cx + 2 if cx + 2 < width else width):
+                for ny in range(cy - 1 if cy > 0 else 0, cy + 2 if cy + 2 < height else height):
+                    chunk = chunks.get((nx >> CHUNK_BITS, ny >> CHUNK_BITS))
+                    if chunk is None:
+                        chunk = self.chunk_at(nx, ny)
+                    offset = ((nx & CHUNK_MASK) << CHUNK_BITS) | (ny & CHUNK_MASK)
+                    if chunk.revealed[offset] or chunk.flagged[offset]:
+                        continue
+                    chunk.revealed[offset] = 1
+                    opened.append((nx, ny))
+                    if chunk.mines[offset]:
+                        self.game_over = True
+                        continue
+                    hidden_safe_cells -= 1
+                    if chunk.adjacent[offset] == 0:
+                        stack.append((nx, ny))
+        self.hidden_safe_cells = hidden_safe_cells
+        return set(opened)
+
+    def toggle_flag(self, x, y):
+        """Flag or unflag a hidden cell, returning the cells that changed"""
+        chunk = self.chunk_at(x, y)
+        offset = ((x & CHUNK_MASK) << CHUNK_BITS) | (y & CHUNK_MASK)
+        if chunk.revealed[offset]:
+            return set()
+        flagged = not chunk.flagged[offset]
+        chunk.flagged[offset] = flagged
+        step = 1 if flagged else -1
+        if chunk.mines[offset]:
+            self.correct_flags += step
+        else:
+            self.wrong_flags += step
+        return {(x, y)}
+
+    def reveal_mines(self):
+        """Show every mine after a loss; returns None as the changed cells can be anywhere"""
+        self.mines_shown = True
+        return None
@@ -0,0 +1,290 @@
+import argparse
+import importlib
+import json
+import sys
+from board import CHORD, FLAG, REVEAL
+from game_manager import GameManager
+from infinite_board import InfiniteBoard
+from replay import replay_moves, restore_from_moves
+
+# Backends are imported on first use, like GameManager.engines
+storage_backends = {
+    "json": ("save_manager", "SaveManager"),
+    "sqlite": ("sqlite_save_manager", "SqliteSaveManager"),
+    "journal": ("journal_save_manager", "JournaledSaveManager")
+}
+
+COMMANDS = {"r": REVEAL, "f": FLAG, "c": CHORD}
+
+HELP = """commands:
+  r X Y   reveal a cell (or just: X Y)
+  f X Y   flag or unflag a cell
+  c X Y   chord: open the neighbours of a number whose mines are flagged
+  h       hint
+  q       quit"""
+
+ENDLESS_HELP = """endless board, coordinates can be negative:
+  r X Y   reveal a cell (or just: X Y)
+  f X Y   flag or unflag a cell
+  c X Y   chord
+  g X Y   move the view to centre on a cell
+  q       quit"""
+
+# Cells shown around the view centre in endless mode
+VIEW_SIZE = (32, 16)
+
+
+def open_storage(name):
+    module_name, class_name = storage_backends[name]
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def render_board(board):
+    """The board as text, x across and y down like the GUI: # hidden, F flag, * mine, . empty"""
+    return render_window(board, 0, 0, board.width, board.height)
+
+
+def render_around(board, x, y):
+    """The cells of a bounded board in a VIEW_SIZE window around (x, y), all of it if it fits"""
+    width, height = min(VIEW_SIZE[0], board.width), min(VIEW_SIZE[1], board.height)
+    left = min(max(0, x - width // 2), board.width - width)
+    top = min(max(0, y - height // 2), board.height - height)
+    return render_window(board, left, top, width, height)
+
+
+def render_window(board, left, top, width, height):
+    """width x height cells of the board from (left, top), drawn like render_board"""
+    lines = ["    " + "".join(f"{x % 100:>3}" for x in range(left, left + width))]
+    for y in range(top, top + height):
+        row = []
+        for x in range(left, left + width):
+            cell = board.grid[x][y]
+            if cell.is_revealed:
+                if cell.is_mine:
+                    row.append("*")
+                else:
+                    row.append(str(cell.adjacent_mines) if cell.adjacent_mines else ".")
+            elif cell.is_flagged:
+                row.append("F")
+            else:
+                row.append("#")
+        lines.append(f"{y:>3} " + "".join(f"{symbol:>3}" for symbol in row))
+    return "\n".join(lines)
+
+
+def parse_command(line):
+    """(action, x, y), ("hint",), ("quit",) or None for a line typed at the prompt"""
+    parts = line.split()
+    if not parts:
+        return None
+    if parts[0] in ("q", "quit"):
+        return ("quit",)
+    if parts[0] in ("h", "hint"):
+        return ("hint",)
+    action = REVEAL
+    if parts[0] in COMMANDS:
+        action = COMMANDS[parts.pop(0)]
+    try:
+        x, y = (int(part) for part in parts)
+    except ValueError:
+        return None
+    return action, x, y
+
+
+def play(args):
+    size = None
+    if args.width or args.height or args.mines:
+        if not (args.width and args.height and args.mines):
+            sys.exit("a custom game needs --width, --height and --mines")
+        args.difficulty, size = GameManager.CUSTOM, (args.width, args.height, args.mines)
+    try:
+        game = GameManager(args.difficulty, open_storage(args.storage), engine=args.engine, size=size)
+    except ValueError as error:
+        sys.exit(str(error))
+    print(HELP)
+    # Large boards are shown a window at a time, following the last move
+    print(render_around(game.board, game.width // 2, game.height // 2))
+    result = "continue"
+    while result == "continue":
+        try:
+            command = parse_command(input("> "))
+        except EOFError:
+            break
+        if command is None:
+            print(HELP)
+            continue
+        if command[0] == "quit":
+            break
+        if command[0] == "hint":
+            hint = game.get_hint()
+            if hint is None:
+                print("no hints on a board this large")
+                continue
+            cell = hint.best_guess()
+            print(f"try {cell[0]} {cell[1]}" if cell else "no hint")
+            continue
+
+        action, x, y = command
+        if not (0 <= x < game.width and 0 <= y < game.height):
+            print("out of the board")
+            continue
+        if action == CHORD:
+            result = game.chord(x, y)
+        else:
+            result = game.make_move(x, y, is_flag=action == FLAG)
+        print(render_around(game.board, x, y))
+
+    if result in ("win", "game_over"):
+        print("You won!" if result == "win" else "Game over! You hit a mine!")
+        try:
+            name = input("Enter your name: ").strip()
+        except EOFError:
+            name = ""
+        if name:
+            game.save_score(name)
+    for error in GameManager.save_writer.flush():
+        print(f"could not save: {error}", file=sys.stderr)
+
+
+def endless(args):
+    board = InfiniteBoard(seed=args.seed)
+    view_width, view_height = VIEW_SIZE
+    left, top = -(view_width // 2), -(view_height // 2)
+    print(ENDLESS_HELP)
+    print(render_window(board, left, top, view_width, view_height))
+    while not board.game_over:
+        try:
+            line = input("> ")
+        except EOFError:
+            break
+        parts = line.split()
+        if parts and parts[0] in ("g", "go"):
+            try:
+                x, y = (int(part) for part in parts[1:])
+            except ValueError:
+                print(ENDLESS_HELP)
+                continue
+            left, top = x - view_width // 2, y - view_height // 2
+            print(render_window(board, left, top, view_width, view_height))
+            continue
+
+        command = parse_command(line)
+        if command is None or command[0] == "hint":
+            print(ENDLESS_HELP)
+            continue
+        if command[0] == "quit":
+            break
+        action, x, y = command
+        if action == CHORD:
+            board.chord(x, y)
+        elif action == FLAG:
+            board.toggle_flag(x, y)
+        else:
+            board.reveal_cell(x, y)
+        if board.game_over:
+            board.reveal_mines()
+            print("Game over! You hit a mine!")
+        print(render_window(board, left, top, view_width, view_height))
+
+    print(f"{board.revealed_safe_cells} cells cleared, {board.correct_flags} mines flagged "
+          f"(world seed {board.seed})")
+
+
+def saved_game(save_manager, index):
+    games = save_manager.load_games()
+    if not games:
+        sys.exit("no saved games")
+    try:
+        return games[index]
+    except IndexError:
+        sys.exit(f"no saved game {index}; there are {len(games)}")
+
+
+def list_games(args):
+    for index, game_data in enumerate(open_storage(args.storage).load_games()):
+        print(f"{index:>5}  {game_data['difficulty']:<7} {game_data['width']}x{game_data['height']}  "
+              f"{game_data['timestamp'][:16]}  {game_data['grid_id']}")
+
+
+def replay(args):
+    save_manager = open_storage(args.storage)
+    game_data = saved_game(save_manager, args.index)
+    grid = game_data["grid"]
+    if not args.step or not isinstance(grid, dict) or "moves" not in grid:
+        print(render_board(GameManager.from_saved(game_data, save_manager).board))
+        return
+
+    width, height, mines = game_data["width"], game_data["height"], game_data["mines"]
+    board = GameManager.engine_class(GameManager.default_engine(width, height))(width, height, mines)
+    restore_from_moves(board, grid["seed"], grid["first_cell"], [])
+    print(render_board(board))
+    for x, y, action in grid["moves"]:
+        replay_moves(board, [(x, y, action)])
+        print(f"\n{['reveal', 'flag', 'chord'][action]} {x} {y}")
+        print(render_board(board))
+
+
+def export(args):
+    save_manager = open_storage(args.storage)
+    game_data = saved_game(save_manager, args.index)
+    board = GameManager.from_saved(game_data, save_manager).board
+    if args.format == "text":
+        output = render_board(board) + "\n"
+    else:
+        grid = game_data["grid"]
+        output = json.dumps({
+            "grid_id": game_data["grid_id"],
+            "difficulty": game_data["difficulty"],
+            "width": board.width,
+            "height": board.height,
+            "mines": board.mines,
+            "seed": board.seed,
+            "first_cell": board.first_cell,
+            "moves": grid.get("moves") if isinstance(grid, dict) else None,
+            "time_elapsed": game_data["time_elapsed"],
+            "completion": board.get_completion_percentage(),
+            "board": render_board(board).split("\n")
+        }, indent=4) + "\n"
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Terminal Minesweeper: play, replay and export games")
+    parser.add_argument("--storage", choices=list(storage_backends), default="json")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play_parser = commands.add_parser("play", help="play a game in the terminal")
+    play_parser.add_argument("--difficulty", choices=list(GameManager.difficulties), default="Easy")
+    play_parser.add_argument("--engine", choices=list(GameManager.engines),
+                             help="defaults to grid, or chunked for giant boards")
+    play_parser.add_argument("--width", type=int, help="custom game; also needs --height and --mines")
+    play_parser.add_argument("--height", type=int)
+    play_parser.add_argument("--mines", type=int)
+    play_parser.set_defaults(func=play)
+
+    endless_parser = commands.add_parser("endless", help="play on an unbounded board")
+    endless_parser.add_argument("--seed", type=int, help="world seed, to play the same world again")
+    endless_parser.set_defaults(func=endless)
+
+    list_parser = commands.add_parser("list", help="list saved games with their index")
+    list_parser.set_defaults(func=list_games)
+
+    replay_parser = commands.add_parser("replay", help="show a saved game")
+    replay_parser.add_argument("index", type=int, nargs="?", default=-1,
+                               help="saved game index from 'list'; defaults to the latest")
+    replay_parser.add_argument("--step", action="store_true", help="print the board after every move")
+    replay_parser.set_defaults(func=replay)
+
+    export_parser = commands.add_parser("export", help="write a saved game as JSON or text")
+    export_parser.add_argument("index", type=int, nargs="?", default=-1)
+    export_parser.add_argument("--format", choices=("json", "text"), default="json")
+    export_parser.add_argument("--output", help="file to write; defaults to standard output")
+    export_parser.set_defaults(func=export)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -1,38 +1,182 @@
+import importlib
+import threading
 import time
-import tkinter as tk
-from board import Board
+from board import CHORD, REVEAL, new_seed, sample_mine_indices
+from metrics import metrics
+from replay import rebuild_board
+from save_writer import SaveWriter
+from solver import Solver
+
+
+class LayoutPrefetcher:
+    """Computes the mine layout of one seed for every possible first click, on a background thread"""
+
+    def __init__(self, width, height, mines):
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.seed = new_seed()
+        # (x, y) -> mine indices; filled while the player is still in the menus
+        self.layouts = {}
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        for x in range(self.width):
+            for y in range(self.height):
+                self.layouts[(x, y)] = sample_mine_indices(self.width, self.height, x, y,
+                                                           self.mines, self.seed)
+
+    def take(self, x, y):
+        """Mine indices for a first click on (x, y), or None if not computed yet"""
+        return self.layouts.get((x, y))
 
 
 class GameManager:
-    def __init__(self, difficulty, save_manager):
-        self.difficulties = {
-            "Easy": (9, 9, 10),
-            "Medium": (16, 16, 40),
-            "Hard": (30, 16, 99)
-        }
+    difficulties = {
+        "Easy": (9, 9, 10),
+        "Medium": (16, 16, 40),
+        "Hard": (30, 16, 99)
+    }
+    # Custom games carry their own (width, height, mines) instead of a difficulties entry
+    CUSTOM = "Custom"
+    # "numpy" keeps cell state in arrays, which pays off on large or bulk boards;
+    # "chunked" only stores the explored parts of giant custom boards.
+    # Engines are imported on first use, so game logic alone never loads numpy
+    engines = {
+        "grid": ("board", "Board"),
+        "numpy": ("numpy_board", "NumpyBoard"),
+        "chunked": ("chunked_board", "ChunkedBoard")
+    }
+    # Boards with more cells than this default to the chunked engine
+    CHUNKED_THRESHOLD = 250000
+    # Boards up to this many cells get their layouts precomputed for every first click
+    PREFETCH_LIMIT = 2500
+    # (width, height, mines) -> LayoutPrefetcher, each used by a single game
+    prefetchers = {}
+    # Saves and scores are written by one background thread so clicks never wait on disk
+    save_writer = SaveWriter()
+
+    def __init__(self, difficulty, save_manager, engine=None, no_guess_pool=None, size=None):
         self.difficulty = difficulty
         self.save_manager = save_manager
-        self.width, self.height, self.mines = self.difficulties[difficulty]
-        self.board = Board(self.width, self.height, self.mines)
+        self.width, self.height, self.mines = size or self.difficulties[difficulty]
+        if self.width < 1 or self.height < 1 or not 0 <= self.mines <= self.width * self.height - 9:
+            raise ValueError(f"Cannot place {self.mines} mines on a {self.width}x{self.height} board")
+        self.engine = engine or self.default_engine(self.width, self.height)
+        self.board = self.create_board(self.width, self.height, self.mines)
         self.start_time = None
         self.time_elapsed = 0
         self.moves = []
+        # False once the game was loaded from a save without a move log
+        self.move_log_complete = True
+        # Cells changed by the last move; None means the whole board needs a redraw
+        self.changed_cells = None
         self.is_loaded_game = False
         self.grid_id = None
+        self.pending_save = None
+        self.solver = Solver()
+        # A NoGuessPool makes the first click lay out a board solvable without guessing
+        self.no_guess_pool = no_guess_pool
+        # False when the pool had no layout for the first click and the board is plain random
+        self.no_guess_verified = None
+
+    @classmethod
+    def from_saved(cls, game_data, save_manager, engine=None):
+        """Rebuild a game from a saved game, or from a grid's details to replay it"""
+        game = cls(game_data["difficulty"], save_manager, engine,
+                   size=(game_data["width"], game_data["height"], game_data["mines"]))
+        game.is_loaded_game = True
+
+        # Set the grid_id from the saved game
+        game.grid_id = game_data["grid_id"]
+        board = game.board
+
+        # Grids from grid details are rebuilt from their seed and first cell
+        if game_data.get("seed") is not None:
+            fx, fy = game_data["first_cell"]
+            board.place_mines(fx, fy, seed=game_data["seed"])
+            board.first_move = False
+            board.reveal_cell(fx, fy)
+            # Logged like a player's reveal, so scores on this grid replay from the log alone
+            game.moves = [(fx, fy, REVEAL)]
+        # Older grids stored their mine positions instead
+        elif game_data.get("mine_positions") is not None:
+            for x, y in game_data["mine_positions"]:
+                board.grid[x][y].is_mine = True
+
+            # Calculate adjacent mines
+            board.compute_adjacency()
+            board.recount()
+
+            # Set first cell if available
+            if game_data.get("first_cell"):
+                board.first_cell = game_data["first_cell"]
+                board.first_move = False
+                fx, fy = game_data["first_cell"]
+                board.reveal_cell(fx, fy)
+        else:
+            # Restore cell states from saved game
+            moves = save_manager.restore_grid(board, game_data["grid"])
+            game.moves = moves or []
+            game.move_log_complete = moves is not None
+
+        game.time_elapsed = game_data["time_elapsed"]
+        return game
+
+    @classmethod
+    def default_engine(cls, width, height):
+        return "chunked" if width * height > cls.CHUNKED_THRESHOLD else "grid"
+
+    @classmethod
+    def engine_class(cls, engine):
+        module_name, class_name = cls.engines[engine]
+        return getattr(importlib.import_module(module_name), class_name)
+
+    def create_board(self, width, height, mines):
+        return self.engine_class(self.engine)(width, height, mines)
+
+    @classmethod
+    def prefetch_layouts(cls, sizes):
+        for size in sizes:
+            width, height, _ = size
+            if size not in cls.prefetchers and width * height <= cls.PREFETCH_LIMIT:
+                cls.prefetchers[size] = LayoutPrefetcher(*size)
+
+    def place_prefetched_mines(self, x, y):
+        size = (self.width, self.height, self.mines)
+        prefetcher = self.prefetchers.pop(size, None)
+        if prefetcher is None:
+            return
+        indices = prefetcher.take(x, y)
+        if indices is not None:
+            self.board.place_mines(x, y, seed=prefetcher.seed, indices=indices)
+            self.board.first_move = False
 
     def start_game(self):
         self.start_time = time.time()
 
+    @metrics.timed("game.make_move")
     def make_move(self, x, y, is_flag=False):
         was_first_move = self.start_time is None
 
         if was_first_move:
             self.start_game()
 
+        if not is_flag and self.board.first_move and self.no_guess_pool is not None:
+            self.no_guess_verified = self.no_guess_pool.place_mines(self.difficulty, self.board, x, y)
+            self.no_guess_pool.refill_in_background({self.difficulty: (self.width, self.height, self.mines)})
+        elif not is_flag and self.board.first_move:
+            self.place_prefetched_mines(x, y)
+
         if is_flag:
-            self.board.toggle_flag(x, y)
+            self.changed_cells = self.board.toggle_flag(x, y)
+        elif metrics.enabled:
+            # Timed here rather than on the board, which simulations call in tight loops
+            with metrics.timer("board.reveal_cell"):
+                self.changed_cells = self.board.reveal_cell(x, y)
         else:
-            self.board.reveal_cell(x, y)
+            self.changed_cells = self.board.reveal_cell(x, y)
 
         self.moves.append((x, y, is_flag))
 
@@ -43,17 +187,22 @@ class GameManager:
             if self.start_time is not None:
                 current_time = self.time_elapsed or (time.time() - self.start_time)
             self.save_game(current_time)
-            # Generate grid_id after first move
-            self.grid_id = self.save_manager.generate_grid_id(
-                [[{
-                    "is_mine": cell.is_mine,
-                    "is_revealed": cell.is_revealed,
-                    "is_flagged": cell.is_flagged,
-                    "adjacent_mines": cell.adjacent_mines,
-                    "first_cell": f"{self.board.first_cell[0]},{self.board.first_cell[1]}"
-                } for cell in row] for row in self.board.grid]
-            )
 
+        return self.game_result()
+
+    @metrics.timed("game.chord")
+    def chord(self, x, y):
+        """Open the unflagged neighbours of a satisfied number, logged as one move"""
+        self.changed_cells = self.board.chord(x, y)
+        if not self.changed_cells:
+            return "continue"
+
+        if self.start_time is None:
+            self.start_game()
+        self.moves.append((x, y, CHORD))
+        return self.game_result()
+
+    def game_result(self):
         if self.board.game_over:
             self.time_elapsed = time.time() - self.start_time
             return "game_over"
@@ -64,28 +213,62 @@ class GameManager:
 
         return "continue"
 
+    def hints_available(self):
+        # The solver reads every cell; past the chunked threshold one hint takes seconds
+        return self.width * self.height <= self.CHUNKED_THRESHOLD
+
+    def get_hint(self):
+        """Safe cells, certain mines and mine probabilities from what the player can see,
+        or None on boards too large to solve"""
+        if not self.hints_available():
+            return None
+        return self.solver.solve(self.board)
+
     def save_game(self, current_time=None):
+        """Queue a save of the game so far; returns a Future of its grid ID"""
         if current_time is None:
             current_time = self.time_elapsed or (time.time() - self.start_time)
 
-        self.save_manager.save_game(
-            self.difficulty,
-            self.board,
-            current_time
-        )
+        board = self.board
+        if board.seed is None:
+            # Unseeded boards from old saves cannot be rebuilt on the writer thread
+            future = self.save_writer.run_now(
+                lambda: self.save_manager.save_game(self.difficulty, board, current_time, self.moves))
+        else:
+            # The writer rebuilds its own copy of the board, so later clicks cannot race the save
+            seed, first_cell, moves = board.seed, board.first_cell, list(self.moves)
+
+            def save():
+                snapshot = rebuild_board(self.width, self.height, self.mines, seed, first_cell, moves,
+                                         self.engine_class(self.engine))
+                return self.save_manager.save_game(self.difficulty, snapshot, current_time, moves)
+
+            # Saves of this game still waiting in the queue collapse into this one
+            future = self.save_writer.submit(save, key=("game", id(self)))
+        self.pending_save = future
+        return future
 
     def save_score(self, player_name):
+        """Queue the score; returns a Future that resolves once it is written"""
         completion = self.board.get_completion_percentage()
-        self.save_manager.save_score(
-            self.difficulty,
-            player_name,
-            completion,
-            self.time_elapsed,
-            self.grid_id
-        )
+        time_elapsed = self.time_elapsed
+        moves = list(self.moves) if self.move_log_complete else None
+        pending_save, grid_id = self.pending_save, self.grid_id
+
+        def save():
+            # The game's own save was queued first, so its grid ID is ready by now
+            score_grid_id = pending_save.result() if pending_save is not None else grid_id
+            self.save_manager.save_score(self.difficulty, player_name, completion, time_elapsed,
+                                         score_grid_id, moves)
+
+        return self.save_writer.submit(save)
 
     def restart_game(self):
         self.board.reset_with_same_first_move()
         self.start_time = None
         self.time_elapsed = 0
-        self.moves = []
\ No newline at end of file
+        # The restart opens the first cell; logging it keeps replays free of special cases
+        self.moves = []
+        if self.board.first_cell is not None:
+            self.moves.append((*self.board.first_cell, REVEAL))
+        self.changed_cells = None
\ No newline at end of file
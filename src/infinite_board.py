@@ -0,0 +1,261 @@
+import random
+from collections import OrderedDict
+from board import new_seed
+from chunked_board import CHUNK_BITS, CHUNK_MASK, CHUNK_SIZE, Chunk, ChunkedCell
+
+CHUNK_CELLS = CHUNK_SIZE * CHUNK_SIZE
+# Mines in every chunk: 160 / 1024 is about Medium's density, low enough for openings
+# and high enough that an opening always ends
+MINES_PER_CHUNK = 160
+# Materialized chunks kept in memory; older ones are reduced to bitsets
+MAX_CHUNKS = 256
+
+# bytearray of 0/1 <-> packed bits, via an ASCII binary string so both ways run in C
+TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+# Cells of a neighbouring chunk that touch this one, by direction
+BORDER = {-1: range(CHUNK_SIZE - 1, CHUNK_SIZE), 0: range(CHUNK_SIZE), 1: range(1)}
+
+
+def pack_cells(values):
+    return int(values.translate(TO_DIGITS), 2).to_bytes(CHUNK_CELLS // 8, "big")
+
+
+def unpack_cells(packed):
+    return bytearray(format(int.from_bytes(packed, "big"), f"0{CHUNK_CELLS}b").encode().translate(FROM_DIGITS))
+
+
+class InfiniteGrid:
+    """board.grid[x][y] for any integer x and y, including negative ones"""
+
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, x):
+        return InfiniteColumn(self.board, x)
+
+
+class InfiniteColumn:
+    def __init__(self, board, x):
+        self.board = board
+        self.x = x
+
+    def __getitem__(self, y):
+        return ChunkedCell(self.board, self.x, y)
+
+
+class InfiniteBoard:
+    """Unbounded board for endless play.
+
+    The mines of a chunk follow from the world seed and the chunk's coordinates, so a
+    chunk is generated when play reaches it and can be dropped and generated again.
+    At most max_chunks chunks are held in full, in least recently used order; the rest
+    keep only their revealed and flagged cells as bitsets, 256 bytes per visited chunk.
+    """
+
+    def __init__(self, seed=None, max_chunks=MAX_CHUNKS):
+        # World seed; with first_cell it identifies the whole board
+        self.seed = seed if seed is not None else new_seed()
+        self.max_chunks = max_chunks
+        # (cx, cy) -> Chunk, least recently used first
+        self.chunks = OrderedDict()
+        # (cx, cy) -> (revealed bits, flagged bits) of evicted chunks
+        self.archive = {}
+        self.grid = InfiniteGrid(self)
+        self.mines_shown = False
+        self.first_move = True
+        self.first_cell = None
+        self.game_over = False
+        self.won = False
+        self.revealed_safe_cells = 0
+        self.correct_flags = 0
+        self.wrong_flags = 0
+
+    def chunk_mines(self, cx, cy):
+        """Mine bytes of a chunk, the same every time for one seed and first cell"""
+        # String seeds are hashed with SHA-512, so layouts are stable across runs and versions
+        rng = random.Random(f"{self.seed}:{cx}:{cy}")
+        mines = bytearray(CHUNK_CELLS)
+        for offset in rng.sample(range(CHUNK_CELLS), MINES_PER_CHUNK):
+            mines[offset] = 1
+        # The 3x3 area around the first click is always clear
+        if self.first_cell is not None:
+            first_x, first_y = self.first_cell
+            for x in range(first_x - 1, first_x + 2):
+                for y in range(first_y - 1, first_y + 2):
+                    if (x >> CHUNK_BITS, y >> CHUNK_BITS) == (cx, cy):
+                        mines[((x & CHUNK_MASK) << CHUNK_BITS) | (y & CHUNK_MASK)] = 0
+        return mines
+
+    def has_mine(self, x, y):
+        chunk = self.chunks.get((x >> CHUNK_BITS, y >> CHUNK_BITS))
+        mines = chunk.mines if chunk is not None else self.chunk_mines(x >> CHUNK_BITS, y >> CHUNK_BITS)
+        return bool(mines[((x & CHUNK_MASK) << CHUNK_BITS) | (y & CHUNK_MASK)])
+
+    def chunk_at(self, x, y, create=True):
+        """The chunk holding (x, y), materialized if it was evicted or create is set"""
+        key = (x >> CHUNK_BITS, y >> CHUNK_BITS)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        if not create and key not in self.archive:
+            return None
+        chunk = self.build_chunk(*key)
+        if key in self.archive:
+            revealed, flagged = self.archive.pop(key)
+            chunk.revealed, chunk.flagged = unpack_cells(revealed), unpack_cells(flagged)
+        self.chunks[key] = chunk
+        if len(self.chunks) > self.max_chunks:
+            self.evict()
+        return chunk
+
+    def evict(self):
+        key, chunk = self.chunks.popitem(last=False)
+        # Chunks that were only looked at are regenerated from the seed alone
+        if 1 in chunk.revealed or 1 in chunk.flagged:
+            self.archive[key] = (pack_cells(chunk.revealed), pack_cells(chunk.flagged))
+
+    def build_chunk(self, cx, cy):
+        chunk = Chunk()
+        chunk.mines = mines = self.chunk_mines(cx, cy)
+        adjacent = chunk.adjacent
+        # Pad the chunk's mines with its neighbours' so edge cells count across the border
+        padded = CHUNK_SIZE + 2
+        area = bytearray(padded * padded)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                source = mines if dx == dy == 0 else self.chunk_mines(cx + dx, cy + dy)
+                for lx in BORDER[dx]:
+                    row = (lx + 1 + dx * CHUNK_SIZE) * padded + 1 + dy * CHUNK_SIZE
+                    for ly in BORDER[dy]:
+                        if source[(lx << CHUNK_BITS) | ly]:
+                            area[row + ly] = 1
+        for lx in range(CHUNK_SIZE):
+            for ly in range(CHUNK_SIZE):
+                offset = (lx << CHUNK_BITS) | ly
+                if mines[offset]:
+                    continue
+                top = lx * padded + ly
+                adjacent[offset] = (area[top] + area[top + 1] + area[top + 2]
+                                    + area[top + padded] + area[top + padded + 2]
+                                    + area[top + 2 * padded] + area[top + 2 * padded + 1]
+                                    + area[top + 2 * padded + 2])
+        return chunk
+
+    def place_mines(self, first_x, first_y):
+        self.first_cell = (first_x, first_y)
+        # Flags placed before the first click stay; mines and counts follow the new layout
+        for key, chunk in self.chunks.items():
+            fresh = self.build_chunk(*key)
+            chunk.mines, chunk.adjacent = fresh.mines, fresh.adjacent
+        self.recount()
+
+    def recount(self):
+        """Rebuild the running counters from the held and archived chunks"""
+        self.revealed_safe_cells = 0
+        self.correct_flags = 0
+        self.wrong_flags = 0
+        states = [(key, chunk.revealed, chunk.flagged) for key, chunk in self.chunks.items()]
+        states += [(key, unpack_cells(revealed), unpack_cells(flagged))
+                   for key, (revealed, flagged) in self.archive.items()]
+        for key, revealed_cells, flagged_cells in states:
+            mines = self.chunks[key].mines if key in self.chunks else self.chunk_mines(*key)
+            for mine, revealed, flagged in zip(mines, revealed_cells, flagged_cells):
+                if mine:
+                    if flagged:
+                        self.correct_flags += 1
+                elif revealed:
+                    self.revealed_safe_cells += 1
+                elif flagged:
+                    self.wrong_flags += 1
+
+    def count_adjacent_mines(self, x, y):
+        return sum(self.has_mine(nx, ny)
+                   for nx in range(x - 1, x + 2) for ny in range(y - 1, y + 2)
+                   if nx != x or ny != y)
+
+    def reveal_cell(self, x, y):
+        """Reveal a cell and flood-fill empty areas, returning the opened cells"""
+        if self.first_move:
+            self.place_mines(x, y)
+            self.first_move = False
+
+        chunk = self.chunk_at(x, y)
+        offset = ((x & CHUNK_MASK) << CHUNK_BITS) | (y & CHUNK_MASK)
+        if chunk.flagged[offset] or chunk.revealed[offset]:
+            return set()
+
+        chunk.revealed[offset] = 1
+        opened = {(x, y)}
+
+        if chunk.mines[offset]:
+            self.game_over = True
+            return opened
+
+        self.revealed_safe_cells += 1
+
+        if chunk.adjacent[offset] == 0:
+            opened |= self.reveal_adjacent_cells(x, y)
+        return opened
+
+    def reveal_adjacent_cells(self, x, y):
+        # Every lookup goes through chunk_at: a long opening may evict chunks it crossed earlier
+        opened = []
+        stack = [(x, y)]
+        while stack:
+            cx, cy = stack.pop()
+            for nx in range(cx - 1, cx + 2):
+                for ny in range(cy - 1, cy + 2):
+                    chunk = self.chunk_at(nx, ny)
+                    offset = ((nx & CHUNK_MASK) << CHUNK_BITS) | (ny & CHUNK_MASK)
+                    if chunk.revealed[offset] or chunk.flagged[offset]:
+                        continue
+                    chunk.revealed[offset] = 1
+                    opened.append((nx, ny))
+                    if chunk.mines[offset]:
+                        self.game_over = True
+                        continue
+                    self.revealed_safe_cells += 1
+                    if chunk.adjacent[offset] == 0:
+                        stack.append((nx, ny))
+        return set(opened)
+
+    def toggle_flag(self, x, y):
+        """Flag or unflag a hidden cell, returning the cells that changed"""
+        chunk = self.chunk_at(x, y)
+        offset = ((x & CHUNK_MASK) << CHUNK_BITS) | (y & CHUNK_MASK)
+        if chunk.revealed[offset]:
+            return set()
+        flagged = not chunk.flagged[offset]
+        chunk.flagged[offset] = flagged
+        step = 1 if flagged else -1
+        if chunk.mines[offset]:
+            self.correct_flags += step
+        else:
+            self.wrong_flags += step
+        return {(x, y)}
+
+    def chord(self, x, y):
+        """Reveal every unflagged neighbour of a number whose mines are all flagged, as one move"""
+        cell = self.grid[x][y]
+        if not cell.is_revealed or cell.is_mine or cell.adjacent_mines == 0:
+            return set()
+        flags = sum(self.grid[nx][ny].is_flagged
+                    for nx in range(x - 1, x + 2) for ny in range(y - 1, y + 2))
+        if flags != cell.adjacent_mines:
+            return set()
+        opened = set()
+        for nx in range(x - 1, x + 2):
+            for ny in range(y - 1, y + 2):
+                opened |= self.reveal_cell(nx, ny)
+        return opened
+
+    def reveal_mines(self):
+        """Show every mine after a loss; returns None as the changed cells can be anywhere"""
+        self.mines_shown = True
+        return None
+
+    def check_win(self):
+        # An endless board is never cleared; the score is the safe cells revealed
+        return False
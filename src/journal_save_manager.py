@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+from metrics import metrics
+from save_manager import LEADERBOARD_SIZE, SaveManager
+
+
+class JournaledSaveManager(SaveManager):
+    """SaveManager that appends new games and scores to a JSON Lines journal.
+
+    The JSON save file becomes a snapshot; the in-memory view is the snapshot plus the
+    journal replayed on top of it. Once the journal passes compact_threshold bytes it is
+    folded into a new snapshot by a background thread.
+    """
+
+    def __init__(self, save_file="minesweeper_saves.json", compact_threshold=1024 * 1024,
+                 background=True):
+        super().__init__(save_file)
+        self.journal_file = save_file + ".journal"
+        # Journal being folded into the snapshot; new records go to a fresh journal meanwhile
+        self.compacting_file = save_file + ".journal.compacting"
+        self.compact_threshold = compact_threshold
+        self.background = background
+        self.lock = threading.Lock()
+        self.compaction_thread = None
+        self.repair_journal()
+        self.data, self.sequence = self.replay()
+
+    def repair_journal(self):
+        """Drop a torn last line left by a crash, so the next append starts on a clean line"""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'rb+') as f:
+            content = f.read()
+            end = content.rfind(b"\n") + 1
+            if end < len(content):
+                f.truncate(end)
+
+    def read_records(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-append; everything before it is intact
+                    return
+
+    def apply_record(self, data, record):
+        if record["type"] == "game":
+            self.add_game(data, record["grid_id"], record["game"], record["grid"])
+        elif record["type"] == "score":
+            self.add_score(data, record["score"])
+
+    def replay_into(self, data, path):
+        # Records already folded into the snapshot are skipped by sequence number,
+        # so a crash between writing the snapshot and deleting the journal is harmless
+        sequence = data.get("journal_sequence", 0)
+        for record in self.read_records(path):
+            if record["sequence"] > sequence:
+                self.apply_record(data, record)
+                sequence = record["sequence"]
+        data["journal_sequence"] = sequence
+        return data
+
+    def replay(self):
+        data = self.load_data()
+        self.replay_into(data, self.compacting_file)
+        self.replay_into(data, self.journal_file)
+        return data, data["journal_sequence"]
+
+    def append_record(self, record):
+        with self.lock:
+            self.sequence += 1
+            record["sequence"] = self.sequence
+            with open(self.journal_file, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.apply_record(self.data, record)
+            self.data["journal_sequence"] = self.sequence
+        self.maybe_compact()
+
+    def maybe_compact(self):
+        if self.compaction_thread is not None and self.compaction_thread.is_alive():
+            return
+        if not os.path.exists(self.journal_file):
+            return
+        if os.path.getsize(self.journal_file) < self.compact_threshold:
+            return
+        self.compact()
+
+    def compact(self):
+        """Fold the current journal into a new snapshot"""
+        with self.lock:
+            # A leftover compacting journal means an earlier compaction was interrupted
+            if not os.path.exists(self.compacting_file) and os.path.exists(self.journal_file):
+                os.replace(self.journal_file, self.compacting_file)
+
+        if self.background:
+            self.compaction_thread = threading.Thread(target=self.write_snapshot, daemon=True)
+            self.compaction_thread.start()
+        else:
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        # Built from the files rather than self.data so the UI thread never waits on it
+        data = self.replay_into(self.load_data(), self.compacting_file)
+        temp_file = self.save_file + ".tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.save_file)
+        if os.path.exists(self.compacting_file):
+            os.remove(self.compacting_file)
+
+    def wait_for_compaction(self):
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
+
+    @metrics.timed("save.save_game")
+    def save_game(self, difficulty, board, time_elapsed, moves=None):
+        grid_id, game_state, grid_info = self.build_game_state(difficulty, board, time_elapsed, moves)
+        self.append_record({
+            "type": "game",
+            "grid_id": grid_id,
+            "game": game_state,
+            "grid": grid_info
+        })
+        return grid_id
+
+    @metrics.timed("save.save_score")
+    def save_score(self, difficulty, player_name, score, time_elapsed, grid_id, moves=None):
+        score_data = self.build_score(difficulty, player_name, score, time_elapsed, grid_id, moves)
+        self.append_record({"type": "score", "score": score_data})
+
+    @metrics.timed("save.load_games")
+    def load_games(self):
+        return self.data["games"]
+
+    def read_index(self):
+        # Everything is in memory after the replay; summaries are added as games arrive
+        games = self.data["games"]
+        if self.index is None:
+            self.index = []
+        self.index.extend(self.game_summary(game_id, games[game_id])
+                          for game_id in range(len(self.index), len(games)))
+        return self.index
+
+    def get_game(self, game_id):
+        games = self.data["games"]
+        return games[game_id] if 0 <= game_id < len(games) else None
+
+    def get_scored_grids_page(self, offset, limit, difficulty=None, since=None, newest_first=True):
+        return self.select_scored_grids_page(self.data, offset, limit, difficulty, since, newest_first)
+
+    @metrics.timed("save.get_scores")
+    def get_scores(self, difficulty=None, grid_id=None):
+        return self.select_scores(self.data, difficulty, grid_id)
+
+    @metrics.timed("save.get_top_scores")
+    def get_top_scores(self, difficulty=None, grid_id=None, limit=LEADERBOARD_SIZE):
+        return self.select_top_scores(self.data, difficulty, grid_id, limit)
+
+    def get_grid_info(self, grid_id):
+        return self.data["grids"].get(grid_id)
+
+    def get_all_grids(self):
+        return self.data["grids"]
@@ -1,27 +1,54 @@
+import argparse
 import tkinter as tk
 from tkinter import messagebox, simpledialog
+import sys
 import time
 from game_manager import GameManager
 from menu_manager import MenuManager
 from save_manager import SaveManager
-from board import Board
+from sqlite_save_manager import SqliteSaveManager
+from journal_save_manager import JournaledSaveManager
+from canvas_renderer import CanvasBoardView, LEFT_BUTTON_MASK, RIGHT_BUTTON_MASK
+from metrics import metrics
+from no_guess import NoGuessPool
 
 
 class MinesweeperGame:
-    def __init__(self):
+    # Boards with more cells than this are drawn on a canvas instead of one button per cell
+    CANVAS_THRESHOLD = 1000
+
+    storage_backends = {
+        "json": SaveManager,
+        "sqlite": SqliteSaveManager,
+        "journal": JournaledSaveManager
+    }
+
+    def __init__(self, renderer=None, storage="json"):
         self.root = tk.Tk()
         self.root.title("Minesweeper")
         self.root.geometry("800x600")
         self.root.configure(bg='#2C3E50')
 
-        self.save_manager = SaveManager()
-        self.menu_manager = MenuManager(self.root, self.save_manager)
+        self.save_manager = self.storage_backends[storage]()
+        self.menu_manager = MenuManager(self.root, self.save_manager, GameManager.save_writer)
         self.game_manager = None
         self.game_frame = None
+        self.renderer = renderer
+        self.board_view = None
+        self.hint_cell = None
+        self.metrics_overlay = None
+        self.no_guess_pool = None
+
+        # F3 shows live latency percentiles, F12 writes them to a JSON file
+        self.root.bind('<F3>', lambda e: self.toggle_metrics_overlay())
+        self.root.bind('<F12>', lambda e: metrics.dump())
 
         # Bind the menu_manager's start_game and load_game methods
         self.menu_manager.start_game = self.start_game
         self.menu_manager.load_game = self.load_game
+        self.menu_manager.prepare_no_guess = self.prepare_no_guess
+        self.menu_manager.prefetch_layouts = lambda: GameManager.prefetch_layouts(
+            GameManager.difficulties.values())
 
         # Start with main menu
         self.menu_manager.create_main_menu()
@@ -43,15 +70,29 @@ class MinesweeperGame:
         self.game_frame = tk.Frame(self.root, bg='#2C3E50')
         self.game_frame.pack(expand=True)
 
+        if self.use_canvas():
+            self.board_view = CanvasBoardView(self.game_frame, self.game_manager,
+                                              self.handle_click, self.handle_right_click,
+                                              on_chord=self.handle_chord)
+            self.board_view.grid(row=0, column=0)
+            control_frame = tk.Frame(self.game_frame, bg='#2C3E50')
+            control_frame.grid(row=1, column=0, pady=10)
+            self.create_control_buttons(control_frame)
+            return
+
         # Create buttons grid
+        self.board_view = None
         self.buttons = []
         for x in range(self.game_manager.width):
             row = []
             for y in range(self.game_manager.height):
                 btn = tk.Button(self.game_frame, width=2, height=1)
                 btn.grid(row=y, column=x, padx=1, pady=1)
-                btn.bind('<Button-1>', lambda e, x=x, y=y: self.handle_click(x, y))
-                btn.bind('<Button-3>', lambda e, x=x, y=y: self.handle_right_click(x, y))
+                btn.bind('<Button-1>', lambda e, x=x, y=y: self.press(e, x, y, self.handle_click,
+                                                                      RIGHT_BUTTON_MASK))
+                btn.bind('<Button-2>', lambda e, x=x, y=y: self.handle_chord(x, y))
+                btn.bind('<Button-3>', lambda e, x=x, y=y: self.press(e, x, y, self.handle_right_click,
+                                                                      LEFT_BUTTON_MASK))
                 row.append(btn)
             self.buttons.append(row)
 
@@ -59,11 +100,37 @@ class MinesweeperGame:
         control_frame = tk.Frame(self.game_frame, bg='#2C3E50')
         control_frame.grid(row=self.game_manager.height + 1, column=0,
                            columnspan=self.game_manager.width, pady=10)
+        self.create_control_buttons(control_frame)
 
+    def create_control_buttons(self, control_frame):
+        if self.game_manager.hints_available():
+            tk.Button(control_frame, text="Hint",
+                      command=self.show_hint,
+                      bg='#F1C40F', fg='white').pack(side=tk.LEFT, padx=5)
         tk.Button(control_frame, text="Return to Menu",
                   command=self.return_to_menu,
                   bg='#E74C3C', fg='white').pack(side=tk.LEFT, padx=5)
 
+    def show_hint(self):
+        result = self.game_manager.get_hint()
+        cell = result.best_guess()
+        if cell is None:
+            return
+        # Clear the previous hint before showing the new one
+        self.update_display([])
+        self.hint_cell = cell
+        color = '#2ECC71' if cell in result.safe_cells else '#F1C40F'
+        x, y = cell
+        if self.board_view is not None:
+            self.board_view.highlight(x, y, color)
+        else:
+            self.buttons[x][y].config(bg=color)
+
+    def use_canvas(self):
+        if self.renderer is not None:
+            return self.renderer == "canvas"
+        return self.game_manager.width * self.game_manager.height > self.CANVAS_THRESHOLD
+
     def update_button(self, x, y):
         cell = self.game_manager.board.grid[x][y]
         btn = self.buttons[x][y]
@@ -85,19 +152,72 @@ class MinesweeperGame:
 
     def handle_click(self, x, y):
         result = self.game_manager.make_move(x, y)
-        self.update_display()
+        self.update_display(self.game_manager.changed_cells)
+        self.refresh_metrics_overlay()
+
+        if self.game_manager.no_guess_verified is False:
+            self.game_manager.no_guess_verified = None
+            messagebox.showwarning("No-Guess", "No verified layout was ready for this cell yet, "
+                                               "so this board may need a guess.")
+
+        if result in ["win", "game_over"]:
+            self.handle_game_end(result == "win")
+
+    def press(self, event, x, y, handler, chord_mask):
+        # Pressing both buttons chords, like the middle button
+        if event.state & chord_mask:
+            self.handle_chord(x, y)
+        else:
+            handler(x, y)
+
+    def handle_chord(self, x, y):
+        result = self.game_manager.chord(x, y)
+        self.update_display(self.game_manager.changed_cells)
+        self.refresh_metrics_overlay()
 
         if result in ["win", "game_over"]:
             self.handle_game_end(result == "win")
 
     def handle_right_click(self, x, y):
         self.game_manager.make_move(x, y, is_flag=True)
-        self.update_display()
-
-    def update_display(self):
-        for x in range(self.game_manager.width):
-            for y in range(self.game_manager.height):
-                self.update_button(x, y)
+        self.update_display(self.game_manager.changed_cells)
+        self.refresh_metrics_overlay()
+
+    @metrics.timed("ui.update_display")
+    def update_display(self, cells=None):
+        # A highlighted hint is cleared by whatever redraw comes next
+        if cells is not None and self.hint_cell is not None:
+            cells = set(cells) | {self.hint_cell}
+        self.hint_cell = None
+
+        if self.board_view is not None:
+            self.board_view.refresh(cells)
+            return
+
+        # Only refresh the given cells; a full redraw is reserved for loads and restarts
+        if cells is None:
+            cells = ((x, y) for x in range(self.game_manager.width)
+                     for y in range(self.game_manager.height))
+        for x, y in cells:
+            self.update_button(x, y)
+
+    def toggle_metrics_overlay(self):
+        if self.metrics_overlay is not None:
+            self.metrics_overlay.destroy()
+            self.metrics_overlay = None
+            return
+        # Recording starts with the overlay unless MINESWEEPER_METRICS already enabled it
+        metrics.enable()
+        self.metrics_overlay = tk.Label(self.root, justify=tk.LEFT, anchor='nw',
+                                        font=('Courier', 9), bg='#000000', fg='#2ECC71')
+        self.metrics_overlay.place(x=0, y=0)
+        self.refresh_metrics_overlay()
+
+    def refresh_metrics_overlay(self):
+        if self.metrics_overlay is not None:
+            lines = metrics.format_lines() or ["no samples yet"]
+            self.metrics_overlay.config(text="\n".join(lines))
+            self.metrics_overlay.lift()
 
     def handle_game_end(self, is_win):
         if is_win:
@@ -105,11 +225,7 @@ class MinesweeperGame:
         else:
             message = "Game Over! You hit a mine!"
             # Reveal all bombs
-            for x in range(self.game_manager.width):
-                for y in range(self.game_manager.height):
-                    if self.game_manager.board.grid[x][y].is_mine:
-                        self.game_manager.board.grid[x][y].is_revealed = True
-            self.update_display()
+            self.update_display(self.game_manager.board.reveal_mines())
 
         player_name = simpledialog.askstring("Game Over",
                                              f"{message}\nEnter your name:")
@@ -122,59 +238,30 @@ class MinesweeperGame:
         self.clear_all_frames()
         self.menu_manager.create_main_menu()
 
-    def start_game(self, difficulty):
-        self.game_manager = GameManager(difficulty, self.save_manager)
+    def prepare_no_guess(self):
+        # Start filling the layout pool as soon as the mode is picked, not on the first click
+        if self.menu_manager.no_guess.get():
+            if self.no_guess_pool is None:
+                # On the shared writer, so the flush on exit covers pool writes too
+                self.no_guess_pool = NoGuessPool(save_writer=GameManager.save_writer)
+            self.no_guess_pool.refill_in_background(GameManager.difficulties)
+
+    def start_game(self, difficulty, size=None):
+        pool = None
+        # The layout pool only covers the standard difficulties
+        if self.menu_manager.no_guess.get() and size is None:
+            self.prepare_no_guess()
+            pool = self.no_guess_pool
+        try:
+            self.game_manager = GameManager(difficulty, self.save_manager, no_guess_pool=pool, size=size)
+        except ValueError as error:
+            messagebox.showerror("Custom Game", str(error))
+            return
         self.game_manager.is_loaded_game = False
         self.create_game_grid()
 
     def load_game(self, game_data):
-        # Create a src game manager with the saved difficulty
-        self.game_manager = GameManager(game_data["difficulty"], self.save_manager)
-        self.game_manager.is_loaded_game = True
-
-        # Set the grid_id from the saved game
-        self.game_manager.grid_id = game_data["grid_id"]
-
-        # Update board dimensions and mines
-        self.game_manager.width = game_data["width"]
-        self.game_manager.height = game_data["height"]
-        self.game_manager.mines = game_data["mines"]
-
-        # Create a src board with saved dimensions
-        self.game_manager.board = Board(game_data["width"], game_data["height"], game_data["mines"])
-
-        # If this is a grid from grid details, set up the mines
-        if "mine_positions" in game_data:
-            for x, y in game_data["mine_positions"]:
-                self.game_manager.board.grid[x][y].is_mine = True
-
-            # Calculate adjacent mines
-            for x in range(self.game_manager.width):
-                for y in range(self.game_manager.height):
-                    if not self.game_manager.board.grid[x][y].is_mine:
-                        self.game_manager.board.grid[x][y].adjacent_mines = (
-                            self.game_manager.board.count_adjacent_mines(x, y)
-                        )
-
-            # Set first cell if available
-            if game_data.get("first_cell"):
-                self.game_manager.board.first_cell = game_data["first_cell"]
-                self.game_manager.board.first_move = False
-                fx, fy = game_data["first_cell"]
-                self.game_manager.board.reveal_cell(fx, fy)
-        else:
-            # Restore cell states from saved game
-            for x in range(game_data["width"]):
-                for y in range(game_data["height"]):
-                    cell_data = game_data["grid"][x][y]
-                    cell = self.game_manager.board.grid[x][y]
-                    cell.is_mine = cell_data["is_mine"]
-                    cell.is_revealed = cell_data["is_revealed"]
-                    cell.is_flagged = cell_data["is_flagged"]
-                    cell.adjacent_mines = cell_data["adjacent_mines"]
-
-        # Set time elapsed
-        self.game_manager.time_elapsed = game_data["time_elapsed"]
+        self.game_manager = GameManager.from_saved(game_data, self.save_manager)
 
         # Create and update the game grid
         self.create_game_grid()
@@ -182,8 +269,14 @@ class MinesweeperGame:
 
     def run(self):
         self.root.mainloop()
+        # Queued saves and scores still go to disk after the window closes
+        for error in GameManager.save_writer.flush():
+            print(f"could not save: {error}", file=sys.stderr)
 
 
 if __name__ == "__main__":
-    game = MinesweeperGame()
+    parser = argparse.ArgumentParser(description="Minesweeper")
+    parser.add_argument("--storage", choices=list(MinesweeperGame.storage_backends), default="json")
+    args = parser.parse_args()
+    game = MinesweeperGame(storage=args.storage)
     game.run()
\ No newline at end of file
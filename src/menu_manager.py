@@ -1,6 +1,12 @@
 import tkinter as tk
-from tkinter import ttk
-from datetime import datetime
+from tkinter import messagebox, simpledialog, ttk
+from datetime import datetime, timedelta
+
+# Rows shown per page in the saved game and grid lists
+PAGE_SIZE = 10
+DIFFICULTY_FILTERS = ["All", "Easy", "Medium", "Hard", "Custom"]
+# Date filter -> days back from today, None for no limit
+DATE_FILTERS = {"Any time": None, "Today": 0, "Last 7 days": 7, "Last 30 days": 30}
 
 
 def format_timestamp(iso_timestamp):
@@ -9,11 +15,91 @@ def format_timestamp(iso_timestamp):
     return timestamp.strftime("%m/%d/%y %I:%M %p")
 
 
+class PagedList:
+    """A list of saved entries shown one page at a time.
+
+    fetch(offset, limit, difficulty, since, newest_first) returns (entries, total) from
+    the save manager, which does the filtering and sorting; only the rows of the current
+    page ever exist as widgets.
+    """
+
+    def __init__(self, parent, fetch, make_row, empty_text, page_size=PAGE_SIZE):
+        self.fetch = fetch
+        self.make_row = make_row
+        self.empty_text = empty_text
+        self.page_size = page_size
+        self.page = 0
+
+        self.frame = tk.Frame(parent, bg='#2C3E50')
+        controls = tk.Frame(self.frame, bg='#2C3E50')
+        controls.pack(pady=5)
+        self.difficulty = tk.StringVar(master=self.frame, value=DIFFICULTY_FILTERS[0])
+        self.date_range = tk.StringVar(master=self.frame, value=next(iter(DATE_FILTERS)))
+        self.newest_first = tk.BooleanVar(master=self.frame, value=True)
+        for variable, values in ((self.difficulty, DIFFICULTY_FILTERS), (self.date_range, list(DATE_FILTERS))):
+            box = ttk.Combobox(controls, textvariable=variable, values=values, state="readonly", width=12)
+            box.bind("<<ComboboxSelected>>", lambda e: self.show(0))
+            box.pack(side="left", padx=5)
+        tk.Checkbutton(controls, text="Newest first", variable=self.newest_first,
+                       command=lambda: self.show(0),
+                       fg='#ECF0F1', bg='#2C3E50', selectcolor='#34495E',
+                       activebackground='#2C3E50', activeforeground='#ECF0F1').pack(side="left", padx=5)
+
+        self.rows = tk.Frame(self.frame, bg='#2C3E50')
+        self.rows.pack(fill='x')
+
+        navigation = tk.Frame(self.frame, bg='#2C3E50')
+        navigation.pack(pady=5)
+        self.previous_button = tk.Button(navigation, text="< Prev", width=8,
+                                         command=lambda: self.show(self.page - 1))
+        self.previous_button.pack(side="left", padx=5)
+        self.page_label = tk.Label(navigation, fg='#ECF0F1', bg='#2C3E50', width=14)
+        self.page_label.pack(side="left")
+        self.next_button = tk.Button(navigation, text="Next >", width=8,
+                                     command=lambda: self.show(self.page + 1))
+        self.next_button.pack(side="left", padx=5)
+
+        self.show(0)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def filters(self):
+        difficulty = self.difficulty.get()
+        days = DATE_FILTERS[self.date_range.get()]
+        since = None
+        if days is not None:
+            since = (datetime.now() - timedelta(days=days)).date().isoformat()
+        return (None if difficulty == "All" else difficulty), since, self.newest_first.get()
+
+    def show(self, page):
+        self.page = max(0, page)
+        entries, total = self.fetch(self.page * self.page_size, self.page_size, *self.filters())
+        pages = max(1, -(-total // self.page_size))
+        if self.page >= pages:
+            # Filters changed the count under us; show the last page instead
+            self.page = pages - 1
+            entries, total = self.fetch(self.page * self.page_size, self.page_size, *self.filters())
+
+        for row in self.rows.winfo_children():
+            row.destroy()
+        if not entries:
+            tk.Label(self.rows, text=self.empty_text, fg='#ECF0F1', bg='#2C3E50').pack(pady=20)
+        for entry in entries:
+            self.make_row(self.rows, entry)
+
+        self.page_label.config(text=f"Page {self.page + 1} of {pages}")
+        self.previous_button.config(state=tk.NORMAL if self.page > 0 else tk.DISABLED)
+        self.next_button.config(state=tk.NORMAL if self.page + 1 < pages else tk.DISABLED)
+
+
 class MenuManager:
-    def __init__(self, root, save_manager):
+    def __init__(self, root, save_manager, save_writer=None):
         self.root = root
         self.save_manager = save_manager
+        self.save_writer = save_writer
         self.current_frame = None
+        self.no_guess = tk.BooleanVar(master=root, value=False)
 
         # Configure style for scrollbar
         style = ttk.Style()
@@ -22,6 +108,15 @@ class MenuManager:
                         troughcolor="#34495E",
                         arrowcolor="white")
 
+    def wait_for_saves(self):
+        # Menus that read the history wait for writes still queued from the last game
+        if self.save_writer is None:
+            return
+        failures = self.save_writer.flush()
+        if failures:
+            messagebox.showerror("Save failed", "Some games or scores could not be saved:\n"
+                                 + "\n".join(str(error) for error in failures))
+
     def clear_window(self):
         if self.current_frame:
             self.current_frame.destroy()
@@ -78,6 +173,9 @@ class MenuManager:
         frame.pack(expand=True)
         self.current_frame = frame
 
+        # Layouts for the first click are computed while the player picks a difficulty
+        self.prefetch_layouts()
+
         title = tk.Label(frame, text="Select Difficulty",
                          font=('Helvetica', 24, 'bold'),
                          fg='#ECF0F1', bg='#2C3E50')
@@ -97,9 +195,28 @@ class MenuManager:
                                     lambda d=diff_name: self.start_game(d),
                                     settings['color'])
 
+        self.create_menu_button(frame, "Custom\nany size, any mines", self.ask_custom_game, '#9B59B6')
+
+        tk.Checkbutton(frame, text="No-guess boards", variable=self.no_guess,
+                       command=self.prepare_no_guess,
+                       font=('Helvetica', 11), fg='#ECF0F1', bg='#2C3E50',
+                       selectcolor='#34495E', activebackground='#2C3E50').pack(pady=5)
+
         self.create_menu_button(frame, "Return", self.create_play_menu, '#7F8C8D')
 
+    def ask_custom_game(self):
+        size = []
+        for prompt, minimum, maximum in (("Width", 5, 5000), ("Height", 5, 5000), ("Mines", 1, None)):
+            value = simpledialog.askinteger("Custom Game", f"{prompt}:", parent=self.root,
+                                            minvalue=minimum, maxvalue=maximum)
+            if value is None:
+                return
+            size.append(value)
+        # Boards past a quarter million cells get the chunked engine automatically
+        self.start_game("Custom", tuple(size))
+
     def create_scoreboard_menu(self):
+        self.wait_for_saves()
         self.clear_window()
         frame = tk.Frame(self.root, bg='#2C3E50')
         frame.pack(expand=True, fill='both')
@@ -143,7 +260,7 @@ class MenuManager:
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
 
         # Add scores by difficulty
-        difficulties = ["Easy", "Medium", "Hard"]
+        difficulties = ["Easy", "Medium", "Hard", "Custom"]
         row = 0
 
         for difficulty in difficulties:
@@ -156,7 +273,7 @@ class MenuManager:
             ).grid(row=row, column=0, pady=10, sticky='w')
             row += 1
 
-            scores = self.save_manager.get_scores(difficulty=difficulty)
+            scores = self.save_manager.get_top_scores(difficulty=difficulty, limit=5)
             if not scores:
                 tk.Label(
                     scrollable_frame,
@@ -166,7 +283,7 @@ class MenuManager:
                 ).grid(row=row, column=0, pady=5)
                 row += 1
             else:
-                for score in scores[:5]:
+                for score in scores:
                     score_text = f"{score['player']}: {score['score']:.1f}% ({score['time']:.1f}s)"
                     score_btn = tk.Button(
                         scrollable_frame,
@@ -184,52 +301,24 @@ class MenuManager:
         grid_frame = tk.Frame(notebook, bg='#2C3E50')
         notebook.add(grid_frame, text='By Grid')
 
-        grid_container = tk.Frame(grid_frame, bg='#2C3E50')
-        grid_container.pack(expand=True, fill='both', padx=20)
-
-        grid_canvas = tk.Canvas(grid_container, bg='#2C3E50', highlightthickness=0)
-        grid_scrollbar = ttk.Scrollbar(grid_container, orient="vertical", command=grid_canvas.yview)
-        grid_scrollable = tk.Frame(grid_canvas, bg='#2C3E50')
-
-        grid_scrollable.bind(
-            "<Configure>",
-            lambda e: grid_canvas.configure(scrollregion=grid_canvas.bbox("all"))
-        )
-
-        grid_canvas.create_window((0, 0), window=grid_scrollable, anchor="nw", width=500)
-        grid_canvas.configure(yscrollcommand=grid_scrollbar.set)
-        grid_canvas.bind_all("<MouseWheel>", _on_mousewheel)
-
-        grids = self.save_manager.get_all_grids()
-        if not grids:
-            tk.Label(
-                grid_scrollable,
-                text="No grids available",
-                fg='#ECF0F1',
-                bg='#2C3E50'
-            ).pack(pady=20)
-        else:
-            for grid_id, grid_info in grids.items():
-                grid_scores = self.save_manager.get_scores(grid_id=grid_id)
-                if grid_scores:
-                    frame = tk.Frame(grid_scrollable, bg='#2C3E50')
-                    frame.pack(fill='x', pady=5)
-
-                    header = f"Grid {grid_id[:8]} ({grid_info['difficulty']})"
-                    btn = tk.Button(
-                        frame,
-                        text=header,
-                        command=lambda gid=grid_id: self.show_grid_details(gid),
-                        bg='#34495E',
-                        fg='#ECF0F1'
-                    )
-                    btn.pack(fill='x')
-
-        # Pack canvases and scrollbars
+        def grid_row(parent, item):
+            grid_id, grid_info = item
+            header = f"Grid {grid_id[:8]} ({grid_info['difficulty']})"
+            tk.Button(
+                parent,
+                text=header,
+                command=lambda gid=grid_id: self.show_grid_details(gid),
+                bg='#34495E',
+                fg='#ECF0F1'
+            ).pack(fill='x', pady=5)
+
+        # Only grids with scores are listed, a page at a time
+        PagedList(grid_frame, self.save_manager.get_scored_grids_page, grid_row,
+                  "No grids available").pack(expand=True, fill='both', padx=20)
+
+        # Pack canvas and scrollbar
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
-        grid_canvas.pack(side="left", fill="both", expand=True)
-        grid_scrollbar.pack(side="right", fill="y")
 
         # Return button at the bottom
         button_frame = tk.Frame(frame, bg='#2C3E50')
@@ -239,6 +328,7 @@ class MenuManager:
     def show_grid_details(self, grid_id):
         if not grid_id:
             return
+        self.wait_for_saves()
 
         grid_info = self.save_manager.get_grid_info(grid_id)
         if not grid_info:
@@ -268,7 +358,7 @@ class MenuManager:
             bg='#2C3E50'
         ).pack(pady=5)
 
-        scores = self.save_manager.get_scores(grid_id=grid_id)
+        scores = self.save_manager.get_top_scores(grid_id=grid_id, limit=5)
         if scores:
             tk.Label(
                 details_frame,
@@ -278,7 +368,7 @@ class MenuManager:
                 bg='#2C3E50'
             ).pack(pady=10)
 
-            for score in scores[:5]:
+            for score in scores:
                 score_text = f"{score['player']}: {score['score']:.1f}% ({score['time']:.1f}s)"
                 tk.Label(
                     details_frame,
@@ -316,11 +406,11 @@ class MenuManager:
         tk.Label(info_frame, text=f"Mines: {grid_info['mines']}",
                  fg='#ECF0F1', bg='#2C3E50', font=('Helvetica', 12)).pack()
 
-        scores = self.save_manager.get_scores(grid_id=grid_id)
+        scores = self.save_manager.get_top_scores(grid_id=grid_id, limit=5)
         if scores:
             tk.Label(frame, text="Top Scores:", fg='#ECF0F1', bg='#2C3E50',
                      font=('Helvetica', 14, 'bold')).pack(pady=10)
-            for score in scores[:5]:
+            for score in scores:
                 score_text = f"{score['player']}: {score['score']:.1f}% ({score['time']:.1f}s)"
                 tk.Label(frame, text=score_text,
                          fg='#ECF0F1', bg='#2C3E50').pack(pady=2)
@@ -331,7 +421,8 @@ class MenuManager:
             "width": grid_info["width"],
             "height": grid_info["height"],
             "mines": grid_info["mines"],
-            "mine_positions": grid_info["mine_positions"],
+            "seed": grid_info.get("seed"),
+            "mine_positions": grid_info.get("mine_positions"),
             "first_cell": grid_info["first_cell"],
             "timestamp": grid_info["created_at"],
             "time_elapsed": 0
@@ -343,6 +434,7 @@ class MenuManager:
                                 self.create_scoreboard_menu, '#E74C3C')
 
     def create_load_game_menu(self):
+        self.wait_for_saves()
         self.clear_window()
         frame = tk.Frame(self.root, bg='#2C3E50')
         frame.pack(expand=True)
@@ -353,20 +445,29 @@ class MenuManager:
                          fg='#ECF0F1', bg='#2C3E50')
         title.pack(pady=30)
 
-        games = self.save_manager.load_games()
-        if not games:
-            tk.Label(frame, text="No saved games found",
-                     fg='#ECF0F1', bg='#2C3E50').pack(pady=20)
-        else:
-            for game in games:
-                formatted_time = format_timestamp(game['timestamp'])
-                game_text = f"{game['difficulty']} - {formatted_time}"
-                self.create_menu_button(frame, game_text,
-                                        lambda g=game: self.load_game(g), '#3498DB')
+        def game_row(parent, summary):
+            formatted_time = format_timestamp(summary['timestamp'])
+            game_text = f"{summary['difficulty']} - {formatted_time}"
+            if summary['progress'] is not None:
+                game_text += f" ({summary['progress']:.0f}%)"
+            # Only the picked game's grid is read from the save
+            self.create_menu_button(parent, game_text,
+                                    lambda game_id=summary['id']: self.load_game(self.save_manager.get_game(game_id)),
+                                    '#3498DB')
+
+        # Full-size menu buttons, so fewer of them per page
+        PagedList(frame, self.save_manager.get_games_page, game_row,
+                  "No saved games found", page_size=6).pack()
 
         self.create_menu_button(frame, "Return", self.create_play_menu, '#E74C3C')
 
-    def start_game(self, difficulty):
+    def start_game(self, difficulty, size=None):
+        pass
+
+    def prepare_no_guess(self):
+        pass
+
+    def prefetch_layouts(self):
         pass
 
     def load_game(self, game_data):
@@ -0,0 +1,106 @@
+import functools
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Histogram:
+    """Rolling window of the latest samples, in seconds"""
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, ordered, fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "p50_ms": self.percentile(ordered, 0.50) * 1000,
+            "p95_ms": self.percentile(ordered, 0.95) * 1000,
+            "p99_ms": self.percentile(ordered, 0.99) * 1000,
+            "max_ms": ordered[-1] * 1000
+        }
+
+
+class Metrics:
+    """Named timers around the hot paths; when disabled a timed call costs one attribute check"""
+
+    def __init__(self, window=1000, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self.histograms = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.histograms = {}
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(self.window)
+        histogram.add(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator recording every call of the function under `name`"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def dump(self, path="minesweeper_metrics.json"):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=4)
+        return path
+
+    def format_lines(self):
+        lines = []
+        for name, stats in self.summary().items():
+            if "p50_ms" in stats:
+                lines.append(f"{name}: n={stats['count']} p50={stats['p50_ms']:.2f} "
+                             f"p95={stats['p95_ms']:.2f} p99={stats['p99_ms']:.2f} ms")
+        return lines
+
+
+# Shared instance; set MINESWEEPER_METRICS=1 to record from startup
+metrics = Metrics(enabled=os.environ.get("MINESWEEPER_METRICS") == "1")
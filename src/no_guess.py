@@ -0,0 +1,237 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from board import Board
+from save_manager import pack_bits, unpack_bits
+from save_writer import SaveWriter
+from solver import Solver
+
+def zero_cells_of(layout, cell_count):
+    """Flat indices of the cells whose click opens the layout's verified opening"""
+    return [index for index, zero in enumerate(unpack_bits(layout["zero_cells"], cell_count)) if zero]
+
+
+def solve_by_logic(board, solver):
+    """Open every certainly safe cell until the board is cleared or a guess would be needed"""
+    while board.hidden_safe_cells:
+        result = solver.solve(board)
+        if not result.safe_cells:
+            return False
+        for x, y in result.safe_cells:
+            board.reveal_cell(x, y)
+        # Flagged mines drop out of the constraints, which keeps the next solve small
+        for x, y in result.mine_cells:
+            if not board.grid[x][y].is_flagged:
+                board.toggle_flag(x, y)
+    return True
+
+
+def verify_layout(board, first_x, first_y, seed, solver):
+    """Zero cells of the opening if the layout is solvable without guessing, else None.
+
+    A click on any zero cell of the opening opens the same area, so the layout is
+    no-guess for all of them, not only for the cell it was generated from.
+    """
+    board.reset()
+    board.place_mines(first_x, first_y, seed=seed)
+    board.first_move = False
+    opened = board.reveal_cell(first_x, first_y)
+    zero_cells = [x * board.height + y for x, y in opened
+                  if board.grid[x][y].adjacent_mines == 0]
+    if not solve_by_logic(board, solver):
+        return None
+    return sorted(zero_cells)
+
+
+# One board per size in each worker process, reset between candidates
+_worker_boards = {}
+
+
+def find_layouts(width, height, mines, targets, seed, max_attempts=5000):
+    """Rejection-sample no-guess layouts until every target cell lies in one's opening.
+
+    Each layout is generated for the first target its predecessors left uncovered;
+    the first click of a layout is always one of its zero cells.
+    """
+    key = (width, height, mines)
+    if key not in _worker_boards:
+        _worker_boards[key] = Board(width, height, mines)
+    board = _worker_boards[key]
+    rng = random.Random(seed)
+    solver = Solver()
+
+    layouts = []
+    covered = set()
+    attempts = 0
+    for x, y in targets:
+        if x * height + y in covered:
+            continue
+        while attempts < max_attempts:
+            attempts += 1
+            layout_seed = rng.getrandbits(63)
+            zero_cells = verify_layout(board, x, y, layout_seed, solver)
+            if zero_cells is not None:
+                covered.update(zero_cells)
+                flags = [False] * (width * height)
+                for index in zero_cells:
+                    flags[index] = True
+                layouts.append({"seed": layout_seed, "first_cell": [x, y], "zero_cells": pack_bits(flags)})
+                break
+    return layouts
+
+
+class NoGuessPool:
+    """On-disk pool of verified no-guess layouts per difficulty.
+
+    Layouts are stored as seed and first cell, so a game started from the pool saves,
+    replays and audits like any other seeded grid. A layout serves a click on any zero
+    cell of its opening; the pool is refilled until every cell of the board is covered
+    by `copies` layouts.
+    """
+
+    def __init__(self, pool_file="no_guess_pool.json", copies=2, workers=None, save_writer=None):
+        self.pool_file = pool_file
+        self.copies = copies
+        # Leave a core for the UI thread
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.lock = threading.Lock()
+        self.refill_thread = None
+        # Pool writes run off the calling thread; the first click must not wait on the disk
+        self.save_writer = save_writer or SaveWriter()
+        # (difficulty, flat cell index) -> stored layouts whose opening contains the cell
+        self.coverage = {}
+        self.data = self.load()
+
+    def load(self):
+        if not os.path.exists(self.pool_file):
+            return {}
+        try:
+            with open(self.pool_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A damaged pool only costs regeneration time
+            return {}
+
+    def save(self):
+        """Queue a write of the pool; called with the lock held"""
+        # Serialized now so the writer never sees the pool mid-change
+        text = json.dumps(self.data)
+        self.save_writer.submit(lambda: self.write(text), key=("pool", self.pool_file))
+
+    def write(self, text):
+        temp_file = self.pool_file + ".tmp"
+        with open(temp_file, 'w') as f:
+            f.write(text)
+        os.replace(temp_file, self.pool_file)
+
+    def layouts(self, difficulty, width, height, mines):
+        """Cell index -> layouts covering it, for one difficulty; called with the lock held"""
+        entry = self.data.get(difficulty)
+        if entry is None or entry["size"] != [width, height, mines] or "layouts" not in entry:
+            # Pools from before per-cell coverage kept too few layouts to be worth migrating
+            entry = self.data[difficulty] = {"size": [width, height, mines], "layouts": []}
+            self.coverage.pop(difficulty, None)
+        if difficulty not in self.coverage:
+            coverage = {}
+            for layout in entry["layouts"]:
+                for index in zero_cells_of(layout, width * height):
+                    coverage.setdefault(index, []).append(layout)
+            self.coverage[difficulty] = coverage
+        return self.coverage[difficulty]
+
+    def take(self, difficulty, width, height, mines, x, y):
+        """Remove and return a stored layout whose opening contains (x, y), or None"""
+        with self.lock:
+            coverage = self.layouts(difficulty, width, height, mines)
+            covering = coverage.get(x * height + y)
+            if not covering:
+                return None
+            layout = covering[0]
+            self.data[difficulty]["layouts"].remove(layout)
+            for index in zero_cells_of(layout, width * height):
+                coverage[index].remove(layout)
+            self.save()
+            return layout
+
+    def missing(self, difficulty, width, height, mines):
+        """Cells covered by fewer than `copies` layouts"""
+        with self.lock:
+            coverage = self.layouts(difficulty, width, height, mines)
+            return [(x, y) for x in range(width) for y in range(height)
+                    if len(coverage.get(x * height + y, ())) < self.copies]
+
+    def add(self, difficulty, width, height, mines, layouts):
+        with self.lock:
+            coverage = self.layouts(difficulty, width, height, mines)
+            self.data[difficulty]["layouts"].extend(layouts)
+            for layout in layouts:
+                for index in zero_cells_of(layout, width * height):
+                    coverage.setdefault(index, []).append(layout)
+            self.save()
+
+    def refill(self, difficulties, max_rounds=10):
+        """Top up every cell of the given {difficulty: (width, height, mines)} on worker processes"""
+        # Spawned workers never inherit the Tk interpreter or its threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            # A round may leave cells short when layouts overlap or a search gives up
+            for _ in range(max_rounds):
+                jobs = []
+                for difficulty, size in difficulties.items():
+                    targets = self.missing(difficulty, *size)
+                    random.shuffle(targets)
+                    # Interleaved, so each worker's targets are spread over the whole board
+                    jobs.extend((difficulty, size, targets[start::self.workers])
+                                for start in range(min(self.workers, len(targets))))
+                if not jobs:
+                    return
+                futures = [(difficulty, size,
+                            pool.submit(find_layouts, *size, targets, random.getrandbits(63)))
+                           for difficulty, size, targets in jobs]
+                for difficulty, size, future in futures:
+                    self.add(difficulty, *size, future.result())
+
+    def refill_in_background(self, difficulties):
+        if self.refill_thread is not None and self.refill_thread.is_alive():
+            return
+        self.refill_thread = threading.Thread(target=self.refill, args=(difficulties,), daemon=True)
+        self.refill_thread.start()
+
+    def place_mines(self, difficulty, board, x, y):
+        """Lay out a no-guess board for a first click on (x, y); returns whether it is verified.
+
+        Never generates on the calling thread: when the pool has no layout for the cell
+        yet, the board gets a plain random layout and the caller is told.
+        """
+        layout = self.take(difficulty, board.width, board.height, board.mines, x, y)
+        if layout is None:
+            board.place_mines(x, y)
+            board.first_move = False
+            return False
+        board.place_mines(*layout["first_cell"], seed=layout["seed"])
+        board.first_move = False
+        return True
+
+
+if __name__ == "__main__":
+    from game_manager import GameManager
+
+    parser = argparse.ArgumentParser(description="Fill the pool of no-guess Minesweeper layouts")
+    parser.add_argument("--difficulty", choices=list(GameManager.difficulties), action="append",
+                        help="may be repeated; defaults to every difficulty")
+    parser.add_argument("--copies", type=int, default=2)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--pool-file", default="no_guess_pool.json")
+    args = parser.parse_args()
+
+    pool = NoGuessPool(args.pool_file, args.copies, args.workers)
+    names = args.difficulty or list(GameManager.difficulties)
+    pool.refill({name: GameManager.difficulties[name] for name in names})
+    for error in pool.save_writer.flush():
+        print(f"could not save the pool: {error}")
+    for name in names:
+        print(f"{name:>7}: {len(pool.data[name]['layouts'])} layouts")
@@ -0,0 +1,238 @@
+from board import BaseBoard, new_seed, sample_mine_indices
+from cell import Cell
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class NumpyCell(Cell):
+    """Cell view backed by the arrays of a NumpyBoard, for code that still walks board.grid"""
+
+    def __init__(self, board, x, y):
+        self.board = board
+        self.x = x
+        self.y = y
+
+    @property
+    def is_mine(self):
+        return bool(self.board.mine_mask[self.x, self.y])
+
+    @is_mine.setter
+    def is_mine(self, value):
+        self.board.mine_mask[self.x, self.y] = value
+
+    @property
+    def is_revealed(self):
+        return bool(self.board.revealed_mask[self.x, self.y])
+
+    @is_revealed.setter
+    def is_revealed(self, value):
+        self.board.revealed_mask[self.x, self.y] = value
+
+    @property
+    def is_flagged(self):
+        return bool(self.board.flagged_mask[self.x, self.y])
+
+    @is_flagged.setter
+    def is_flagged(self, value):
+        self.board.flagged_mask[self.x, self.y] = value
+
+    @property
+    def adjacent_mines(self):
+        return int(self.board.adjacent_counts[self.x, self.y])
+
+    @adjacent_mines.setter
+    def adjacent_mines(self, value):
+        self.board.adjacent_counts[self.x, self.y] = value
+
+
+class NumpyBoard(BaseBoard):
+    """Board engine storing cell state in compact arrays indexed [x, y], same API as Board"""
+
+    def __init__(self, width, height, mines):
+        if np is None:
+            raise ImportError("NumpyBoard requires numpy (pip install numpy)")
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.mine_mask = np.zeros((width, height), dtype=bool)
+        self.revealed_mask = np.zeros((width, height), dtype=bool)
+        self.flagged_mask = np.zeros((width, height), dtype=bool)
+        self.adjacent_counts = np.zeros((width, height), dtype=np.uint8)
+        self._grid = None
+        self.first_move = True
+        self.first_cell = None
+        # Seed of the mine layout; with first_cell it identifies the grid
+        self.seed = None
+        self.game_over = False
+        self.won = False
+        # Running counters so check_win and get_completion_percentage never scan the arrays
+        self.hidden_safe_cells = width * height - mines
+        self.correct_flags = 0
+        self.wrong_flags = 0
+
+    def recount(self):
+        """Rebuild the running counters after cells were changed directly (loads, placement)"""
+        revealed_safe = int(np.count_nonzero(self.revealed_mask & ~self.mine_mask))
+        self.correct_flags = int(np.count_nonzero(self.flagged_mask & self.mine_mask))
+        self.wrong_flags = int(np.count_nonzero(self.flagged_mask & ~self.mine_mask & ~self.revealed_mask))
+        self.hidden_safe_cells = self.width * self.height - self.mines - revealed_safe
+
+    @property
+    def grid(self):
+        # Cell views are only built when something asks for them (UI, save files)
+        if self._grid is None:
+            self._grid = [[NumpyCell(self, x, y) for y in range(self.height)]
+                          for x in range(self.width)]
+        return self._grid
+
+    def place_mines(self, first_x, first_y, seed=None, indices=None):
+        self.first_cell = (first_x, first_y)
+        self.seed = seed if seed is not None else new_seed()
+
+        if indices is None:
+            indices = sample_mine_indices(self.width, self.height, first_x, first_y,
+                                          self.mines, self.seed)
+        self.mine_mask.ravel()[indices] = True
+
+        self.compute_adjacency()
+        self.recount()
+
+    def compute_adjacency(self):
+        """Count adjacent mines for every cell with one vectorized neighbour sum"""
+        padded = np.pad(self.mine_mask, 1).astype(np.uint8)
+        counts = np.zeros((self.width, self.height), dtype=np.uint8)
+        for dx in (0, 1, 2):
+            for dy in (0, 1, 2):
+                if dx == 1 and dy == 1:
+                    continue
+                counts += padded[dx:dx + self.width, dy:dy + self.height]
+        counts[self.mine_mask] = 0
+        self.adjacent_counts = counts
+
+    def mine_indices(self):
+        return np.flatnonzero(self.mine_mask).tolist()
+
+    def cell_flags(self, name):
+        """One cell attribute (is_mine, is_revealed, is_flagged) for every cell, column by column"""
+        return self.masks()[name].ravel().tolist()
+
+    def set_cell_flags(self, name, values):
+        self.masks()[name].ravel()[:] = values
+
+    def masks(self):
+        return {
+            "is_mine": self.mine_mask,
+            "is_revealed": self.revealed_mask,
+            "is_flagged": self.flagged_mask
+        }
+
+    def reset(self):
+        """Clear the board for a new game, reusing its arrays"""
+        self.mine_mask[:] = False
+        self.revealed_mask[:] = False
+        self.flagged_mask[:] = False
+        self.adjacent_counts[:] = 0
+
+        self.first_move = True
+        self.first_cell = None
+        self.seed = None
+        self.game_over = False
+        self.won = False
+        self.hidden_safe_cells = self.width * self.height - self.mines
+        self.correct_flags = 0
+        self.wrong_flags = 0
+
+    def count_adjacent_mines(self, x, y):
+        area = self.mine_mask[max(0, x - 1):x + 2, max(0, y - 1):y + 2]
+        return int(area.sum()) - int(self.mine_mask[x, y])
+
+    def reveal_cell(self, x, y):
+        """Reveal a cell and flood-fill empty areas, returning the opened cells"""
+        if self.first_move:
+            self.place_mines(x, y)
+            self.first_move = False
+
+        if self.flagged_mask[x, y] or self.revealed_mask[x, y]:
+            return set()
+
+        self.revealed_mask[x, y] = True
+        opened = {(x, y)}
+
+        if self.mine_mask[x, y]:
+            self.game_over = True
+            return opened
+
+        self.hidden_safe_cells -= 1
+
+        if self.adjacent_counts[x, y] == 0:
+            opened |= self.reveal_adjacent_cells(x, y)
+        return opened
+
+    def reveal_adjacent_cells(self, x, y):
+        # Flat memoryviews give fast scalar access while writing straight into the arrays
+        revealed = memoryview(self.revealed_mask.reshape(-1))
+        flagged = memoryview(self.flagged_mask.reshape(-1))
+        is_mine = memoryview(self.mine_mask.reshape(-1))
+        adjacent = memoryview(self.adjacent_counts.reshape(-1))
+        width, height = self.width, self.height
+
+        opened = []
+        hidden_safe_cells = self.hidden_safe_cells
+        stack = [(x, y)]
+        while stack:
+            cx, cy = stack.pop()
+            x_start = cx - 1 if cx > 0 else 0
+            x_end = cx + 2 if cx + 2 < width else width
+            y_start = cy - 1 if cy > 0 else 0
+            y_end = cy + 2 if cy + 2 < height else height
+            for nx in range(x_start, x_end):
+                offset = nx * height
+                for ny in range(y_start, y_end):
+                    index = offset + ny
+                    if revealed[index] or flagged[index]:
+                        continue
+                    revealed[index] = True
+                    opened.append((nx, ny))
+                    if is_mine[index]:
+                        self.game_over = True
+                        continue
+                    hidden_safe_cells -= 1
+                    if adjacent[index] == 0:
+                        stack.append((nx, ny))
+        self.hidden_safe_cells = hidden_safe_cells
+        return set(opened)
+
+    def toggle_flag(self, x, y):
+        """Flag or unflag a hidden cell, returning the cells that changed"""
+        if self.revealed_mask[x, y]:
+            return set()
+        flagged = not self.flagged_mask[x, y]
+        self.flagged_mask[x, y] = flagged
+        step = 1 if flagged else -1
+        if self.mine_mask[x, y]:
+            self.correct_flags += step
+        else:
+            self.wrong_flags += step
+        return {(x, y)}
+
+    def chord(self, x, y):
+        """Reveal every unflagged neighbour of a number whose mines are all flagged, as one move"""
+        if not self.revealed_mask[x, y] or self.mine_mask[x, y] or self.adjacent_counts[x, y] == 0:
+            return set()
+        x_start, x_end = max(0, x - 1), min(self.width, x + 2)
+        y_start, y_end = max(0, y - 1), min(self.height, y + 2)
+        if int(self.flagged_mask[x_start:x_end, y_start:y_end].sum()) != self.adjacent_counts[x, y]:
+            return set()
+        opened = set()
+        for nx in range(x_start, x_end):
+            for ny in range(y_start, y_end):
+                opened |= self.reveal_cell(nx, ny)
+        return opened
+
+    def reveal_mines(self):
+        """Show every mine after a loss, returning their cells"""
+        self.revealed_mask |= self.mine_mask
+        return [(int(x), int(y)) for x, y in np.argwhere(self.mine_mask)]
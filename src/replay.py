@@ -0,0 +1,82 @@
+import sys
+import time
+from board import CHORD, Board
+
+
+def replay_moves(board, moves):
+    """Apply (x, y, action) moves in bulk: no per-move win checks, timers or saves"""
+    reveal_cell = board.reveal_cell
+    toggle_flag = board.toggle_flag
+    for x, y, action in moves:
+        if action == CHORD:
+            board.chord(x, y)
+        elif action:
+            toggle_flag(x, y)
+        else:
+            reveal_cell(x, y)
+        if board.game_over:
+            break
+    return board
+
+
+def restore_from_moves(board, seed, first_cell, moves):
+    """Bring a fresh board to the state given by its grid identity (seed, first cell) and moves"""
+    first_x, first_y = first_cell
+    board.place_mines(first_x, first_y, seed=seed)
+    board.first_move = False
+    # Every opening reveal is in the log, restarts included, so flags placed before it
+    # replay in the order they were made
+    return replay_moves(board, moves)
+
+
+def rebuild_board(width, height, mines, seed, first_cell, moves, board_class=Board):
+    return restore_from_moves(board_class(width, height, mines), seed, first_cell, moves)
+
+
+def audit_score(grid_info, score_data, board_class=Board):
+    """Replay a submitted score; None when the grid or the score cannot be replayed"""
+    if grid_info is None or grid_info.get("seed") is None or score_data.get("moves") is None:
+        return None
+    board = rebuild_board(grid_info["width"], grid_info["height"], grid_info["mines"],
+                          grid_info["seed"], grid_info["first_cell"], score_data["moves"],
+                          board_class)
+    return abs(board.get_completion_percentage() - score_data["score"]) < 1e-6
+
+
+def validate_history(save_manager, board_class=Board):
+    """Replay every replayable saved game and audit every replayable score"""
+    summary = {"games": 0, "scores": 0, "skipped": 0, "mismatches": []}
+
+    for game in save_manager.load_games():
+        grid = game["grid"]
+        if not isinstance(grid, dict) or "moves" not in grid:
+            summary["skipped"] += 1
+            continue
+        rebuild_board(game["width"], game["height"], game["mines"],
+                      grid["seed"], grid["first_cell"], grid["moves"], board_class)
+        summary["games"] += 1
+
+    grids = save_manager.get_all_grids()
+    for grid_id, grid_info in grids.items():
+        for score_data in save_manager.get_scores(grid_id=grid_id):
+            result = audit_score(grid_info, score_data, board_class)
+            if result is None:
+                summary["skipped"] += 1
+                continue
+            summary["scores"] += 1
+            if not result:
+                summary["mismatches"].append(score_data)
+    return summary
+
+
+if __name__ == "__main__":
+    from save_manager import SaveManager
+
+    save_file = sys.argv[1] if len(sys.argv) > 1 else "minesweeper_saves.json"
+    start = time.perf_counter()
+    result = validate_history(SaveManager(save_file))
+    elapsed = time.perf_counter() - start
+    print(f"replayed {result['games']} games and audited {result['scores']} scores "
+          f"in {elapsed:.2f}s ({result['skipped']} not replayable)")
+    for score_data in result["mismatches"]:
+        print(f"mismatch: {score_data['player']} {score_data['score']:.1f}% on {score_data['grid_id']}")
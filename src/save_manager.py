@@ -1,12 +1,83 @@
+import base64
+import bisect
 import json
 import os
 from datetime import datetime
 import hashlib
+from metrics import metrics
+from replay import restore_from_moves
+
+# Saved grids: format 3 is the grid identity plus the move log, format 2 packs
+# mines/revealed/flagged into bitsets for unseeded boards, older saves are per-cell dicts
+GRID_FORMAT_BITSET = 2
+GRID_FORMAT_MOVES = 3
+
+# Scores kept in each difficulty's leaderboard
+LEADERBOARD_SIZE = 10
+
+# Bytes of the index's first line, padded so it can be rewritten in place
+INDEX_HEADER_SIZE = 96
+
+
+def pack_bits(values):
+    """Pack booleans into a base64 bitset, least significant bit first"""
+    packed = bytearray((len(values) + 7) // 8)
+    for index, value in enumerate(values):
+        if value:
+            packed[index >> 3] |= 1 << (index & 7)
+    return base64.b64encode(bytes(packed)).decode("ascii")
+
+
+def unpack_bits(text, count):
+    packed = base64.b64decode(text)
+    return [bool(packed[index >> 3] >> (index & 7) & 1) for index in range(count)]
+
+
+def score_rank(score_data):
+    """Sort key of a score: best percentage first, then fastest"""
+    return -score_data["score"], score_data["time"]
+
+
+def leaderboard_entry(score_data):
+    # Leaderboards are for display; the move log stays with the grid's full score list
+    return {key: value for key, value in score_data.items() if key != "moves"}
+
+
+def entry_filter(difficulty=None, since=None, date_key="timestamp"):
+    """Test for saved entries of a difficulty dated on or after `since` (an ISO date or timestamp)"""
+    def matches(entry):
+        return ((not difficulty or entry["difficulty"] == difficulty)
+                and (not since or entry[date_key] >= since))
+    return matches
+
+
+def page_of(items, offset, limit, matches):
+    """(page, total): the matching items from offset to offset + limit, and how many match"""
+    page = []
+    total = 0
+    for item in items:
+        if matches(item):
+            if offset <= total < offset + limit:
+                page.append(item)
+            total += 1
+    return page, total
 
 
 class SaveManager:
-    def __init__(self):
-        self.save_file = "minesweeper_saves.json"
+    def __init__(self, save_file="minesweeper_saves.json"):
+        self.save_file = save_file
+        # Summaries of the saved games, kept next to the save file so listing them
+        # never parses a grid; valid for the save file's (mtime, size) it records
+        self.index_file = save_file + ".index"
+        self.index = None
+        self.index_signature = None
+        # Summaries in the index file, which self.index may have grown past in memory
+        self.index_count = 0
+        # Parsed copy of the save file, valid while the file's (mtime, size) is unchanged
+        self.cache = None
+        self.cache_signature = None
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.ensure_save_file_exists()
 
     def ensure_save_file_exists(self):
@@ -33,16 +104,69 @@ class SaveManager:
 
         return hashlib.md5(grid_str.encode()).hexdigest()
 
-    def save_game(self, difficulty, board, time_elapsed):
-        grid_data = [[{
-            "is_mine": cell.is_mine,
-            "is_revealed": cell.is_revealed,
-            "is_flagged": cell.is_flagged,
-            "adjacent_mines": cell.adjacent_mines,
-            "first_cell": f"{board.first_cell[0]},{board.first_cell[1]}" if board.first_cell else None
-        } for cell in row] for row in board.grid]
+    def generate_board_grid_id(self, board):
+        """Same ID as generate_grid_id, computed from the board without serializing it"""
+        height = board.height
+        grid_str = "".join(f"{index // height},{index % height};" for index in board.mine_indices())
+        if board.first_cell:
+            grid_str += f"first:{board.first_cell[0]},{board.first_cell[1]}"
+        return hashlib.md5(grid_str.encode()).hexdigest()
+
+    def encode_grid(self, board, moves=None):
+        if board.seed is not None and moves is not None:
+            return {
+                "format": GRID_FORMAT_MOVES,
+                "seed": board.seed,
+                "first_cell": board.first_cell,
+                "moves": [[x, y, int(action)] for x, y, action in moves]
+            }
+        return {
+            "format": GRID_FORMAT_BITSET,
+            "mines": pack_bits(board.cell_flags("is_mine")),
+            "revealed": pack_bits(board.cell_flags("is_revealed")),
+            "flagged": pack_bits(board.cell_flags("is_flagged")),
+            "first_cell": board.first_cell,
+            "seed": board.seed
+        }
+
+    def restore_grid(self, board, grid_data):
+        """Load a saved grid into a board; returns its move log, or None if it was not saved"""
+        count = board.width * board.height
+        grid_format = grid_data.get("format") if isinstance(grid_data, dict) else None
+        if grid_format == GRID_FORMAT_MOVES:
+            moves = [(x, y, action) for x, y, action in grid_data["moves"]]
+            restore_from_moves(board, grid_data["seed"], grid_data["first_cell"], moves)
+            return moves
+        if grid_format == GRID_FORMAT_BITSET:
+            board.set_cell_flags("is_mine", unpack_bits(grid_data["mines"], count))
+            board.set_cell_flags("is_revealed", unpack_bits(grid_data["revealed"], count))
+            board.set_cell_flags("is_flagged", unpack_bits(grid_data["flagged"], count))
+            # Adjacency is not stored, it is cheaper to recompute than to parse
+            board.compute_adjacency()
+            board.seed = grid_data.get("seed")
+            first_cell = grid_data.get("first_cell")
+        else:
+            for x in range(board.width):
+                for y in range(board.height):
+                    cell_data = grid_data[x][y]
+                    cell = board.grid[x][y]
+                    cell.is_mine = cell_data["is_mine"]
+                    cell.is_revealed = cell_data["is_revealed"]
+                    cell.is_flagged = cell_data["is_flagged"]
+                    cell.adjacent_mines = cell_data["adjacent_mines"]
+            first_cell = grid_data[0][0].get("first_cell")
+            if first_cell:
+                first_cell = [int(value) for value in first_cell.split(",")]
+
+        if first_cell:
+            board.first_cell = tuple(first_cell)
+            board.first_move = False
+        board.recount()
+        return None
 
-        grid_id = self.generate_grid_id(grid_data)
+    def build_game_state(self, difficulty, board, time_elapsed, moves=None):
+        """Serialize a board into the saved game entry and its grid configuration"""
+        grid_id = self.generate_board_grid_id(board)
 
         game_state = {
             "grid_id": grid_id,
@@ -50,84 +174,273 @@ class SaveManager:
             "width": board.width,
             "height": board.height,
             "mines": board.mines,
-            "grid": grid_data,
+            "grid": self.encode_grid(board, moves),
             "timestamp": datetime.now().isoformat(),
-            "time_elapsed": time_elapsed
+            "time_elapsed": time_elapsed,
+            "progress": board.get_completion_percentage()
         }
 
-        with open(self.save_file, 'r+') as f:
-            data = json.load(f)
-
-            # Store grid configuration if it's src
-            if grid_id not in data["grids"]:
-                data["grids"][grid_id] = {
-                    "difficulty": difficulty,
-                    "width": board.width,
-                    "height": board.height,
-                    "mines": board.mines,
-                    "mine_positions": [(x, y) for x in range(board.width)
-                                       for y in range(board.height)
-                                       if board.grid[x][y].is_mine],
-                    "first_cell": board.first_cell,
-                    "created_at": datetime.now().isoformat()
-                }
-
-            data["games"].append(game_state)
-            f.seek(0)
-            json.dump(data, f, indent=4)
-            f.truncate()
+        grid_info = {
+            "difficulty": difficulty,
+            "width": board.width,
+            "height": board.height,
+            "mines": board.mines,
+            "seed": board.seed,
+            "first_cell": board.first_cell,
+            "created_at": datetime.now().isoformat()
+        }
+        # The seed and first cell rebuild the layout; only unseeded boards list their mines
+        if board.seed is None:
+            height = board.height
+            grid_info["mine_positions"] = [(index // height, index % height)
+                                           for index, is_mine in enumerate(board.cell_flags("is_mine"))
+                                           if is_mine]
+        return grid_id, game_state, grid_info
 
-    def load_games(self):
+    def file_signature(self):
+        stat = os.stat(self.save_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def load_data(self):
         with open(self.save_file, 'r') as f:
-            data = json.load(f)
-            return data["games"]
-
-    def save_score(self, difficulty, player_name, score, time_elapsed, grid_id):
-        with open(self.save_file, 'r+') as f:
-            data = json.load(f)
-
-            # Initialize scores for this grid if needed
-            if grid_id not in data["scores"]:
-                data["scores"][grid_id] = []
-
-            # Add score
-            score_data = {
-                "player": player_name,
-                "score": score,
-                "time": time_elapsed,
-                "timestamp": datetime.now().isoformat(),
-                "difficulty": difficulty,
-                "grid_id": grid_id
-            }
+            return json.load(f)
 
-            data["scores"][grid_id].append(score_data)
-            data["scores"][grid_id].sort(key=lambda x: (-x["score"], x["time"]))
+    def read_data(self):
+        """Return the parsed save file, re-reading it only if another process changed it"""
+        signature = self.file_signature()
+        if self.cache is not None and signature == self.cache_signature:
+            self.cache_hits += 1
+            return self.cache
 
-            f.seek(0)
+        self.cache_misses += 1
+        self.cache = self.load_data()
+        self.cache_signature = signature
+        return self.cache
+
+    def write_data(self, data):
+        previous_signature = self.file_signature()
+        # Write a temp file and rename it over the save, so a crash never leaves half a file
+        temp_file = self.save_file + ".tmp"
+        with open(temp_file, 'w') as f:
             json.dump(data, f, indent=4)
-            f.truncate()
+        os.replace(temp_file, self.save_file)
+        # Our own write keeps the cache valid, so remember the file as we left it
+        self.cache = data
+        self.cache_signature = self.file_signature()
+
+        # Games are only ever appended, so an index that matched the old file catches up
+        # by appending; without one it is built from the data just written
+        games = data["games"]
+        if self.load_index(previous_signature) is None:
+            self.write_index([self.game_summary(game_id, game_state) for game_id, game_state in enumerate(games)])
+        else:
+            self.append_index([self.game_summary(game_id, games[game_id])
+                               for game_id in range(self.index_count, len(games))])
+
+    def game_summary(self, game_id, game_state):
+        """What the game list shows for a saved game; game_id is its position in the save"""
+        return {
+            "id": game_id,
+            "grid_id": game_state["grid_id"],
+            "difficulty": game_state["difficulty"],
+            "width": game_state["width"],
+            "height": game_state["height"],
+            "timestamp": game_state["timestamp"],
+            "time_elapsed": game_state["time_elapsed"],
+            # Saves from before the index have no progress recorded
+            "progress": game_state.get("progress")
+        }
 
+    def index_header(self, signature, count):
+        header = json.dumps({"signature": list(signature), "games": count})
+        return header.ljust(INDEX_HEADER_SIZE - 1).encode() + b"\n"
+
+    def load_index(self, signature):
+        """The stored game summaries if they were written for the save file at `signature`, else None"""
+        if self.index is not None and self.index_signature == signature:
+            return self.index
+        try:
+            with open(self.index_file, 'rb') as f:
+                stored = json.loads(f.readline())
+                if tuple(stored.get("signature", ())) != signature:
+                    return None
+                summaries = [json.loads(line) for line in f]
+        except (OSError, ValueError):
+            return None
+        if len(summaries) != stored.get("games"):
+            return None
+        self.index = summaries
+        self.index_signature = signature
+        self.index_count = len(summaries)
+        return self.index
+
+    def write_index(self, summaries):
+        """Write the whole index: a header with the save file's signature, then a summary per line"""
+        signature = self.file_signature()
+        temp_file = self.index_file + ".tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(self.index_header(signature, len(summaries)))
+            f.writelines(json.dumps(summary).encode() + b"\n" for summary in summaries)
+        os.replace(temp_file, self.index_file)
+        self.index = list(summaries)
+        self.index_signature = signature
+        self.index_count = len(summaries)
+
+    def append_index(self, summaries):
+        """Add summaries to the end of a current index and point its header at the save file.
+
+        The header goes last: a crash before it leaves the old signature, which no longer
+        matches the save file, so the index is rebuilt rather than trusted.
+        """
+        signature = self.file_signature()
+        count = self.index_count + len(summaries)
+        with open(self.index_file, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            f.writelines(json.dumps(summary).encode() + b"\n" for summary in summaries)
+            f.seek(0)
+            f.write(self.index_header(signature, count))
+        self.index = self.index[:self.index_count] + summaries
+        self.index_signature = signature
+        self.index_count = count
+
+    def read_index(self):
+        """Summaries of every saved game in save order, without parsing their grids"""
+        index = self.load_index(self.file_signature())
+        if index is None:
+            # Missing, damaged, or the save file was changed by something else
+            games = self.read_data()["games"]
+            index = [self.game_summary(game_id, game_state) for game_id, game_state in enumerate(games)]
+            self.write_index(index)
+        return index
+
+    def cache_stats(self):
+        return {"hits": self.cache_hits, "misses": self.cache_misses}
+
+    def add_game(self, data, grid_id, game_state, grid_info):
+        # Store grid configuration if it's src
+        if grid_id not in data["grids"]:
+            data["grids"][grid_id] = grid_info
+
+        data["games"].append(game_state)
+
+    def build_score(self, difficulty, player_name, score, time_elapsed, grid_id, moves=None):
+        score_data = {
+            "player": player_name,
+            "score": score,
+            "time": time_elapsed,
+            "timestamp": datetime.now().isoformat(),
+            "difficulty": difficulty,
+            "grid_id": grid_id
+        }
+        # The move log lets the score be audited by replaying it on the grid
+        if moves is not None:
+            score_data["moves"] = [[x, y, int(action)] for x, y, action in moves]
+        return score_data
+
+    def leaderboards(self, data):
+        """Top LEADERBOARD_SIZE scores per difficulty, kept in the save data.
+
+        Save files written before leaderboards existed get them built here once; the
+        next write stores them.
+        """
+        if "leaderboards" not in data:
+            by_difficulty = {}
+            for grid_scores in data["scores"].values():
+                for score_data in grid_scores:
+                    by_difficulty.setdefault(score_data["difficulty"], []).append(leaderboard_entry(score_data))
+            data["leaderboards"] = {difficulty: sorted(scores, key=score_rank)[:LEADERBOARD_SIZE]
+                                    for difficulty, scores in by_difficulty.items()}
+        return data["leaderboards"]
+
+    def add_score(self, data, score_data):
+        leaderboards = self.leaderboards(data)
+
+        # Each grid's list stays sorted, so a new score is inserted in place
+        grid_scores = data["scores"].setdefault(score_data["grid_id"], [])
+        bisect.insort(grid_scores, score_data, key=score_rank)
+
+        leaderboard = leaderboards.setdefault(score_data["difficulty"], [])
+        if len(leaderboard) < LEADERBOARD_SIZE or score_rank(score_data) < score_rank(leaderboard[-1]):
+            bisect.insort(leaderboard, leaderboard_entry(score_data), key=score_rank)
+            del leaderboard[LEADERBOARD_SIZE:]
+
+    def select_scores(self, data, difficulty=None, grid_id=None):
+        if grid_id:
+            return data["scores"].get(grid_id, [])
+        elif difficulty:
+            all_scores = []
+            for grid_scores in data["scores"].values():
+                all_scores.extend([score for score in grid_scores
+                                   if score["difficulty"] == difficulty])
+            all_scores.sort(key=lambda x: (-x["score"], x["time"]))
+            return all_scores
+        return []
+
+    def select_top_scores(self, data, difficulty=None, grid_id=None, limit=LEADERBOARD_SIZE):
+        if grid_id:
+            return data["scores"].get(grid_id, [])[:limit]
+        elif difficulty:
+            return self.leaderboards(data).get(difficulty, [])[:limit]
+        return []
+
+    def select_games_page(self, summaries, offset, limit, difficulty=None, since=None, newest_first=True):
+        # Games are appended as they are saved, so list order is date order
+        games = reversed(summaries) if newest_first else summaries
+        return page_of(games, offset, limit, entry_filter(difficulty, since))
+
+    def select_scored_grids_page(self, data, offset, limit, difficulty=None, since=None, newest_first=True):
+        grids = data["grids"].items()
+        scored = ((grid_id, grid_info) for grid_id, grid_info in (reversed(grids) if newest_first else grids)
+                  if data["scores"].get(grid_id))
+        matches = entry_filter(difficulty, since, "created_at")
+        return page_of(scored, offset, limit, lambda item: matches(item[1]))
+
+    @metrics.timed("save.save_game")
+    def save_game(self, difficulty, board, time_elapsed, moves=None):
+        grid_id, game_state, grid_info = self.build_game_state(difficulty, board, time_elapsed, moves)
+
+        data = self.read_data()
+        self.add_game(data, grid_id, game_state, grid_info)
+        self.write_data(data)
+        return grid_id
+
+    @metrics.timed("save.load_games")
+    def load_games(self):
+        return self.read_data()["games"]
+
+    @metrics.timed("save.get_games_page")
+    def get_games_page(self, offset, limit, difficulty=None, since=None, newest_first=True):
+        """(summaries, total): one page of game summaries matching the filters, and how many match"""
+        return self.select_games_page(self.read_index(), offset, limit, difficulty, since, newest_first)
+
+    def get_game(self, game_id):
+        """The full saved game behind a summary's id, or None"""
+        games = self.read_data()["games"]
+        return games[game_id] if 0 <= game_id < len(games) else None
+
+    def get_scored_grids_page(self, offset, limit, difficulty=None, since=None, newest_first=True):
+        """([(grid_id, grid_info)], total) for grids with at least one score"""
+        return self.select_scored_grids_page(self.read_data(), offset, limit, difficulty, since, newest_first)
+
+    @metrics.timed("save.save_score")
+    def save_score(self, difficulty, player_name, score, time_elapsed, grid_id, moves=None):
+        score_data = self.build_score(difficulty, player_name, score, time_elapsed, grid_id, moves)
+
+        data = self.read_data()
+        self.add_score(data, score_data)
+        self.write_data(data)
+
+    @metrics.timed("save.get_scores")
     def get_scores(self, difficulty=None, grid_id=None):
-        with open(self.save_file, 'r') as f:
-            data = json.load(f)
-
-            if grid_id:
-                return data["scores"].get(grid_id, [])
-            elif difficulty:
-                all_scores = []
-                for grid_scores in data["scores"].values():
-                    all_scores.extend([score for score in grid_scores
-                                       if score["difficulty"] == difficulty])
-                all_scores.sort(key=lambda x: (-x["score"], x["time"]))
-                return all_scores
-            return []
+        return self.select_scores(self.read_data(), difficulty, grid_id)
+
+    @metrics.timed("save.get_top_scores")
+    def get_top_scores(self, difficulty=None, grid_id=None, limit=LEADERBOARD_SIZE):
+        """Best scores for a grid, or for a difficulty (at most LEADERBOARD_SIZE), without sorting"""
+        return self.select_top_scores(self.read_data(), difficulty, grid_id, limit)
 
     def get_grid_info(self, grid_id):
-        with open(self.save_file, 'r') as f:
-            data = json.load(f)
-            return data["grids"].get(grid_id)
+        return self.read_data()["grids"].get(grid_id)
 
     def get_all_grids(self):
-        with open(self.save_file, 'r') as f:
-            data = json.load(f)
-            return data["grids"]
\ No newline at end of file
+        return self.read_data()["grids"]
@@ -0,0 +1,81 @@
+import queue
+import threading
+
+
+def new_future():
+    # concurrent.futures imports logging; loading it on the first save keeps headless startup fast
+    from concurrent.futures import Future
+    return Future()
+
+
+class SaveJob:
+    def __init__(self, func, key):
+        self.func = func
+        self.key = key
+        self.future = new_future()
+
+
+class SaveWriter:
+    """Runs save writes on one background thread, in the order they were submitted.
+
+    A write submitted with a key replaces a queued, not yet started write with the same
+    key, so back-to-back saves of one game become a single write of its latest state.
+    """
+
+    def __init__(self, max_pending=32):
+        # Bounded: a caller submitting faster than the disk keeps up waits in submit
+        self.queue = queue.Queue(max_pending)
+        self.lock = threading.Lock()
+        # key -> queued job that has not started yet
+        self.pending = {}
+        # Exceptions of failed writes not yet reported by flush
+        self.failures = []
+        self.thread = None
+
+    def submit(self, func, key=None):
+        """Queue func() and return a Future of its result"""
+        with self.lock:
+            job = self.pending.get(key) if key is not None else None
+            if job is not None:
+                job.func = func
+                return job.future
+            job = SaveJob(func, key)
+            if key is not None:
+                self.pending[key] = job
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        self.queue.put(job)
+        return job.future
+
+    def run(self):
+        while True:
+            job = self.queue.get()
+            with self.lock:
+                if job.key is not None:
+                    self.pending.pop(job.key, None)
+                func = job.func
+            try:
+                job.future.set_result(func())
+            except Exception as error:
+                job.future.set_exception(error)
+                with self.lock:
+                    self.failures.append(error)
+            finally:
+                self.queue.task_done()
+
+    def run_now(self, func):
+        """Run func() on the calling thread after every queued write, as a finished Future"""
+        # Failures stay recorded for the next flush
+        self.queue.join()
+        future = new_future()
+        future.set_result(func())
+        return future
+
+    def flush(self):
+        """Block until every submitted write has finished; returns the exceptions of those
+        that failed since the last flush, so nobody waits on a write without learning it was lost"""
+        self.queue.join()
+        with self.lock:
+            failures, self.failures = self.failures, []
+        return failures
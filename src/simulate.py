@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from game_manager import GameManager
+from solver import Solver
+
+
+def random_strategy(board, rng, solver):
+    """Reveal a random hidden, unflagged cell"""
+    hidden = [(x, y) for x in range(board.width) for y in range(board.height)
+              if not board.grid[x][y].is_revealed and not board.grid[x][y].is_flagged]
+    return [(*rng.choice(hidden), False)]
+
+
+def solver_strategy(board, rng, solver):
+    """Flag certain mines and open certain safe cells, guessing the least likely mine otherwise"""
+    result = solver.solve(board)
+    moves = [(x, y, True) for x, y in sorted(result.mine_cells)
+             if not board.grid[x][y].is_flagged]
+    if result.safe_cells:
+        moves.extend((x, y, False) for x, y in sorted(result.safe_cells))
+    else:
+        cell = result.best_guess()
+        if cell is not None:
+            moves.append((*cell, False))
+    return moves
+
+
+strategies = {
+    "random": random_strategy,
+    "solver": solver_strategy
+}
+
+
+def play_game(board, strategy, rng, solver):
+    """Play one game on a reset board; no timers, no GameManager, no save file"""
+    first_x, first_y = rng.randrange(board.width), rng.randrange(board.height)
+    board.place_mines(first_x, first_y, seed=rng.getrandbits(63))
+    board.first_move = False
+    opening = len(board.reveal_cell(first_x, first_y))
+    moves = 1
+
+    while not board.game_over and board.hidden_safe_cells:
+        planned = strategy(board, rng, solver)
+        if not planned:
+            break
+        for x, y, is_flag in planned:
+            if is_flag:
+                board.toggle_flag(x, y)
+            else:
+                board.reveal_cell(x, y)
+            moves += 1
+            if board.game_over:
+                break
+
+    if not board.game_over and not board.hidden_safe_cells:
+        # Every safe cell is open, so every hidden cell left is a mine: flag them to finish,
+        # as strategies that never flag would otherwise never win
+        for x in range(board.width):
+            for y in range(board.height):
+                cell = board.grid[x][y]
+                if not cell.is_revealed and not cell.is_flagged:
+                    board.toggle_flag(x, y)
+        board.check_win()
+
+    return {
+        "won": board.won,
+        "opening": opening,
+        "moves": moves,
+        "completion": board.get_completion_percentage()
+    }
+
+
+def new_totals():
+    return {"games": 0, "wins": 0, "opening": 0, "moves": 0, "completion": 0.0,
+            "won_moves": 0, "elapsed": 0.0}
+
+
+def add_totals(totals, other):
+    for key, value in other.items():
+        totals[key] += value
+    return totals
+
+
+# One board per (difficulty, engine) in each worker process, reset between games
+_worker_boards = {}
+
+
+def run_batch(difficulty, strategy_name, games, seed, engine="grid"):
+    key = (difficulty, engine)
+    if key not in _worker_boards:
+        width, height, mines = GameManager.difficulties[difficulty]
+        _worker_boards[key] = GameManager.engine_class(engine)(width, height, mines)
+    board = _worker_boards[key]
+    strategy = strategies[strategy_name]
+    rng = random.Random(seed)
+    solver = Solver()
+
+    totals = new_totals()
+    start = time.perf_counter()
+    for _ in range(games):
+        board.reset()
+        result = play_game(board, strategy, rng, solver)
+        totals["games"] += 1
+        totals["wins"] += result["won"]
+        totals["opening"] += result["opening"]
+        totals["moves"] += result["moves"]
+        totals["completion"] += result["completion"]
+        if result["won"]:
+            totals["won_moves"] += result["moves"]
+    totals["elapsed"] = time.perf_counter() - start
+    return difficulty, totals
+
+
+def summarize(totals):
+    games = totals["games"] or 1
+    return {
+        "games": totals["games"],
+        "win_rate": totals["wins"] / games,
+        "mean_opening": totals["opening"] / games,
+        "mean_moves": totals["moves"] / games,
+        "mean_moves_won": totals["won_moves"] / totals["wins"] if totals["wins"] else None,
+        "mean_completion": totals["completion"] / games
+    }
+
+
+def simulate(difficulties, strategy, games, output, workers=None, batch_size=200, seed=0,
+             engine="grid"):
+    """Play games on a process pool, appending each finished batch to `output` as JSON Lines"""
+    jobs = []
+    for difficulty in difficulties:
+        for start in range(0, games, batch_size):
+            jobs.append((difficulty, min(batch_size, games - start)))
+
+    results = {difficulty: new_totals() for difficulty in difficulties}
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(output, 'a') as f:
+        futures = [pool.submit(run_batch, difficulty, strategy, count, seed * 1000003 + index, engine)
+                   for index, (difficulty, count) in enumerate(jobs)]
+        for future in as_completed(futures):
+            difficulty, totals = future.result()
+            add_totals(results[difficulty], totals)
+            f.write(json.dumps({"difficulty": difficulty, "strategy": strategy, **totals}) + "\n")
+            f.flush()
+
+    summary = {difficulty: summarize(totals) for difficulty, totals in results.items()}
+    with open(output, 'a') as f:
+        f.write(json.dumps({"summary": summary, "strategy": strategy}) + "\n")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play headless Minesweeper games in bulk")
+    parser.add_argument("--difficulty", choices=list(GameManager.difficulties), action="append",
+                        help="may be repeated; defaults to every difficulty")
+    parser.add_argument("--strategy", choices=list(strategies), default="solver")
+    parser.add_argument("--games", type=int, default=1000, help="games per difficulty")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=list(GameManager.engines), default="grid")
+    parser.add_argument("--output", default="simulation_results.jsonl")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = simulate(args.difficulty or list(GameManager.difficulties), args.strategy,
+                       args.games, args.output, args.workers, args.batch_size, args.seed,
+                       args.engine)
+    for difficulty, stats in summary.items():
+        print(f"{difficulty:>7}: {stats['games']} games, win rate {stats['win_rate']:.1%}, "
+              f"opening {stats['mean_opening']:.1f} cells, {stats['mean_moves']:.1f} moves")
+    print(f"{time.perf_counter() - start:.1f}s")
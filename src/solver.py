@@ -0,0 +1,345 @@
+from math import comb
+
+
+class ComponentTooLarge(Exception):
+    pass
+
+
+class SolverResult:
+    def __init__(self, safe_cells, mine_cells, probabilities):
+        # Cells that are safe / mines in every layout consistent with what the player sees
+        self.safe_cells = safe_cells
+        self.mine_cells = mine_cells
+        # Hidden, unflagged cell -> probability of being a mine
+        self.probabilities = probabilities
+
+    def best_guess(self):
+        """A certainly safe cell if there is one, otherwise the least likely mine"""
+        if self.safe_cells:
+            return min(self.safe_cells)
+        if self.probabilities:
+            return min(self.probabilities, key=lambda cell: (self.probabilities[cell], cell))
+        return None
+
+
+class Solver:
+    """Reasons about a board using only revealed numbers and flags, never the mine layout.
+
+    Single-cell and subset rules settle most cells; what is left of the frontier is split
+    into independent components whose layouts are enumerated for exact probabilities.
+    """
+
+    def __init__(self, max_component_size=60, max_search_nodes=50000):
+        # Components beyond these limits get a density estimate instead of exact enumeration
+        self.max_component_size = max_component_size
+        self.max_search_nodes = max_search_nodes
+
+    def solve(self, board):
+        width, height = board.width, board.height
+        grid = board.grid
+        unknown = set()
+        # Flags are taken at face value; revealed mines are visible after a loss
+        known_mines = 0
+        constraints = []
+
+        for x in range(width):
+            column = grid[x]
+            for y in range(height):
+                cell = column[y]
+                if cell.is_revealed:
+                    if cell.is_mine:
+                        known_mines += 1
+                elif cell.is_flagged:
+                    known_mines += 1
+                else:
+                    unknown.add((x, y))
+
+        for x in range(width):
+            column = grid[x]
+            for y in range(height):
+                cell = column[y]
+                if not cell.is_revealed or cell.is_mine:
+                    continue
+                cells = []
+                value = cell.adjacent_mines
+                for nx in range(max(0, x - 1), min(width, x + 2)):
+                    for ny in range(max(0, y - 1), min(height, y + 2)):
+                        neighbour = grid[nx][ny]
+                        if neighbour.is_revealed:
+                            if neighbour.is_mine:
+                                value -= 1
+                        elif neighbour.is_flagged:
+                            value -= 1
+                        else:
+                            cells.append((nx, ny))
+                if cells:
+                    constraints.append((frozenset(cells), value))
+
+        safe, mines, constraints = self.propagate(constraints)
+        remaining_mines = board.mines - known_mines - len(mines)
+        probabilities, estimated = self.probabilities(unknown - safe - mines, constraints, remaining_mines)
+
+        for cell in safe:
+            probabilities[cell] = 0.0
+        for cell in mines:
+            probabilities[cell] = 1.0
+        for cell, probability in list(probabilities.items()):
+            # Estimates are never promoted to certainties
+            if cell in safe or cell in mines or cell in estimated:
+                continue
+            if probability <= 0.0:
+                safe.add(cell)
+            elif probability >= 1.0:
+                mines.add(cell)
+        return SolverResult(safe, mines, probabilities)
+
+    def propagate(self, constraints):
+        """Apply single-cell and subset rules until nothing changes"""
+        safe = set()
+        mines = set()
+        constraints = set(constraints)
+
+        changed = True
+        while changed:
+            changed = False
+
+            # Drop settled cells from every constraint
+            reduced = set()
+            for cells, value in constraints:
+                known_mines = cells & mines
+                cells = cells - safe - known_mines
+                if cells:
+                    reduced.add((cells, value - len(known_mines)))
+            constraints = reduced
+
+            for cells, value in constraints:
+                if value == 0:
+                    new = cells - safe
+                    if new:
+                        safe |= new
+                        changed = True
+                elif value == len(cells):
+                    new = cells - mines
+                    if new:
+                        mines |= new
+                        changed = True
+            if changed:
+                continue
+
+            # Subset rule: A within B means B - A holds value(B) - value(A) mines
+            by_cell = {}
+            for constraint in constraints:
+                for cell in constraint[0]:
+                    by_cell.setdefault(cell, []).append(constraint)
+            derived = set()
+            for small_cells, small_value in constraints:
+                first = next(iter(small_cells))
+                for big_cells, big_value in by_cell[first]:
+                    if len(big_cells) > len(small_cells) and small_cells <= big_cells:
+                        derived.add((big_cells - small_cells, big_value - small_value))
+            new_constraints = derived - constraints
+            if new_constraints:
+                constraints |= new_constraints
+                changed = True
+
+        return safe, mines, list(constraints)
+
+    def components(self, constraints):
+        """Split the frontier into groups of cells that share no constraint"""
+        parent = {}
+
+        def find(cell):
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for cells, _ in constraints:
+            for cell in cells:
+                parent.setdefault(cell, cell)
+            first = find(next(iter(cells)))
+            for cell in cells:
+                root = find(cell)
+                if root != first:
+                    parent[root] = first
+
+        groups = {}
+        for constraint in constraints:
+            root = find(next(iter(constraint[0])))
+            groups.setdefault(root, ([], []))
+            groups[root][1].append(constraint)
+        for cell in parent:
+            groups[find(cell)][0].append(cell)
+        return list(groups.values())
+
+    def search_order(self, cells, constraints):
+        """Breadth-first order through shared constraints, so constraints close early and prune"""
+        neighbours = {cell: set() for cell in cells}
+        for group, _ in constraints:
+            for cell in group:
+                neighbours[cell] |= group
+        start = min(cells)
+        order = [start]
+        seen = {start}
+        for cell in order:
+            for neighbour in sorted(neighbours[cell] - seen):
+                seen.add(neighbour)
+                order.append(neighbour)
+        return order
+
+    def enumerate_component(self, cells, constraints):
+        """Count layouts of a component by mine total: {mines: (layouts, {cell: layouts with a mine})}
+
+        Raises ComponentTooLarge when the search passes max_search_nodes.
+        """
+        index = {cell: i for i, cell in enumerate(cells)}
+        # Per constraint: mines still needed and cells still unassigned
+        need = [value for _, value in constraints]
+        left = [len(group) for group, _ in constraints]
+        cell_constraints = [[] for _ in cells]
+        for position, (group, _) in enumerate(constraints):
+            for cell in group:
+                cell_constraints[index[cell]].append(position)
+
+        assignment = [0] * len(cells)
+        results = {}
+        budget = [self.max_search_nodes]
+
+        def search(position, placed):
+            budget[0] -= 1
+            if budget[0] < 0:
+                raise ComponentTooLarge()
+            if position == len(cells):
+                entry = results.setdefault(placed, [0, [0] * len(cells)])
+                entry[0] += 1
+                per_cell = entry[1]
+                for i, value in enumerate(assignment):
+                    if value:
+                        per_cell[i] += 1
+                return
+            touched = cell_constraints[position]
+            for value in (0, 1):
+                assignment[position] = value
+                consistent = True
+                for c in touched:
+                    need[c] -= value
+                    left[c] -= 1
+                    if need[c] < 0 or need[c] > left[c]:
+                        consistent = False
+                if consistent:
+                    search(position + 1, placed + value)
+                for c in touched:
+                    need[c] += value
+                    left[c] += 1
+            assignment[position] = 0
+
+        search(0, 0)
+        return {mines: (count, dict(zip(cells, per_cell)))
+                for mines, (count, per_cell) in results.items()}
+
+    def probabilities(self, unknown, constraints, remaining_mines):
+        """Mine probability of every unknown cell, and the cells whose probability is an estimate.
+
+        Components too large to enumerate only get a density estimate. Their mine count
+        is then only known on average, so the count shared with the rest of the board
+        stops being exact too; only what a component's own layouts settle stays certain.
+        """
+        frontier = set()
+        for cells, _ in constraints:
+            frontier |= cells
+        interior = [cell for cell in unknown if cell not in frontier]
+        probabilities = {}
+        estimated = set()
+
+        enumerated = []
+        for cells, group in self.components(constraints):
+            if len(cells) <= self.max_component_size:
+                try:
+                    enumerated.append(self.enumerate_component(self.search_order(cells, group), group))
+                    continue
+                except ComponentTooLarge:
+                    pass
+            # Too large to enumerate: fall back to each constraint's local density
+            for group_cells, value in group:
+                density = value / len(group_cells)
+                for cell in group_cells:
+                    probabilities[cell] = max(probabilities.get(cell, 0.0), density)
+            estimated.update(cells)
+
+        # The estimated cells' expected mines come out of the count the rest shares
+        counted_mines = remaining_mines - round(sum(probabilities[cell] for cell in estimated))
+        if estimated:
+            estimated.update(interior)
+
+        # Combine components: distribution of the total number of frontier mines
+        totals = {0: 1}
+        for layouts in enumerated:
+            combined = {}
+            for total, ways in totals.items():
+                for mines, (count, _) in layouts.items():
+                    combined[total + mines] = combined.get(total + mines, 0) + ways * count
+            totals = combined
+
+        def interior_ways(frontier_mines):
+            left = counted_mines - frontier_mines
+            if left < 0 or left > len(interior):
+                return 0
+            return comb(len(interior), left)
+
+        weight = sum(ways * interior_ways(total) for total, ways in totals.items())
+        if weight == 0 and not estimated:
+            # Inconsistent view (for instance a wrong flag): no exact answer
+            return probabilities, estimated
+
+        for position, layouts in enumerate(enumerated):
+            if estimated:
+                self.settle_locally(layouts, probabilities, estimated, weighted=weight > 0)
+            if weight == 0:
+                continue
+            # Layout totals of every other component
+            others = {0: 1}
+            for other_position, other in enumerate(enumerated):
+                if other_position == position:
+                    continue
+                combined = {}
+                for total, ways in others.items():
+                    for mines, (count, _) in other.items():
+                        combined[total + mines] = combined.get(total + mines, 0) + ways * count
+                others = combined
+            cell_weights = {}
+            for mines, (count, per_cell) in layouts.items():
+                scale = sum(ways * interior_ways(total + mines) for total, ways in others.items())
+                for cell, with_mine in per_cell.items():
+                    cell_weights[cell] = cell_weights.get(cell, 0) + with_mine * scale
+            for cell, cell_weight in cell_weights.items():
+                # With estimates in play, cells the component settled on its own keep 0 or 1
+                if not estimated or cell in estimated:
+                    probabilities[cell] = cell_weight / weight
+
+        if interior:
+            if weight:
+                expected = sum(ways * interior_ways(total) * (counted_mines - total)
+                               for total, ways in totals.items())
+                interior_probability = expected / weight / len(interior)
+            else:
+                interior_probability = min(1.0, max(0.0, counted_mines / len(interior)))
+            for cell in interior:
+                probabilities[cell] = interior_probability
+        return probabilities, estimated
+
+    def settle_locally(self, layouts, probabilities, estimated, weighted):
+        """Fix the cells a component's own layouts agree on; the rest become estimates"""
+        layout_count = sum(count for count, _ in layouts.values())
+        with_mine = {}
+        for count, per_cell in layouts.values():
+            for cell, layouts_with_mine in per_cell.items():
+                with_mine[cell] = with_mine.get(cell, 0) + layouts_with_mine
+        for cell, cell_layouts in with_mine.items():
+            if cell_layouts == 0:
+                probabilities[cell] = 0.0
+            elif cell_layouts == layout_count:
+                probabilities[cell] = 1.0
+            else:
+                estimated.add(cell)
+                if not weighted:
+                    probabilities[cell] = cell_layouts / layout_count
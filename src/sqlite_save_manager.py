@@ -0,0 +1,286 @@
+import base64
+import json
+import os
+import sqlite3
+from metrics import metrics
+from save_manager import GRID_FORMAT_BITSET, LEADERBOARD_SIZE, SaveManager
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    grid_id TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    grid TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    time_elapsed REAL NOT NULL,
+    grid_bits BLOB
+);
+CREATE TABLE IF NOT EXISTS grids (
+    grid_id TEXT PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    mine_positions TEXT,
+    seed INTEGER,
+    first_cell TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    grid_id TEXT,
+    player TEXT NOT NULL,
+    score REAL NOT NULL,
+    time REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    moves TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_games_difficulty ON games (difficulty);
+CREATE INDEX IF NOT EXISTS idx_grids_difficulty ON grids (difficulty);
+CREATE INDEX IF NOT EXISTS idx_scores_difficulty ON scores (difficulty, score DESC, time);
+CREATE INDEX IF NOT EXISTS idx_scores_grid_id ON scores (grid_id, score DESC, time);
+"""
+
+# Bitsets of a format 2 grid, stored back to back in games.grid_bits
+GRID_BITSETS = ("mines", "revealed", "flagged")
+
+# Columns added after the first schema, created in place on older databases
+ADDED_COLUMNS = {
+    "games": [("progress", "REAL"), ("grid_bits", "BLOB")],
+    "grids": [("seed", "INTEGER")],
+    "scores": [("moves", "TEXT")]
+}
+
+
+class SqliteSaveManager(SaveManager):
+    """SaveManager storing games, grids and scores in an indexed SQLite database"""
+
+    def __init__(self, db_file="minesweeper_saves.db", json_file="minesweeper_saves.json"):
+        self.json_file = json_file
+        # First-move saves run on GameManager's save thread, one statement at a time
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # Sets up the attributes inherited methods rely on, then our ensure_save_file_exists
+        super().__init__(db_file)
+
+    def ensure_save_file_exists(self):
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            for table, added in ADDED_COLUMNS.items():
+                columns = [row["name"] for row in self.connection.execute(f"PRAGMA table_info({table})")]
+                for name, column_type in added:
+                    if name not in columns:
+                        self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+        self.migrate_from_json()
+
+    def migrate_from_json(self):
+        """Import the legacy JSON save file once, the first time the database is opened"""
+        migrated = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'migrated_from_json'"
+        ).fetchone()
+        if migrated or not self.json_file or not os.path.exists(self.json_file):
+            return
+
+        with open(self.json_file, 'r') as f:
+            data = json.load(f)
+
+        with self.connection:
+            for grid_id, grid_info in data.get("grids", {}).items():
+                self.insert_grid(grid_id, grid_info)
+            for game_state in data.get("games", []):
+                self.insert_game(game_state)
+            for grid_scores in data.get("scores", {}).values():
+                for score_data in grid_scores:
+                    self.insert_score(score_data)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                (self.json_file,)
+            )
+
+    def insert_grid(self, grid_id, grid_info):
+        self.connection.execute(
+            "INSERT OR IGNORE INTO grids (grid_id, difficulty, width, height, mines, "
+            "mine_positions, seed, first_cell, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (grid_id, grid_info["difficulty"], grid_info["width"], grid_info["height"],
+             grid_info["mines"], json.dumps(grid_info.get("mine_positions")),
+             grid_info.get("seed"), json.dumps(grid_info["first_cell"]), grid_info["created_at"])
+        )
+
+    def insert_game(self, game_state):
+        grid, grid_bits = self.split_grid(game_state["grid"])
+        self.connection.execute(
+            "INSERT INTO games (grid_id, difficulty, width, height, mines, grid, timestamp, "
+            "time_elapsed, progress, grid_bits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (game_state["grid_id"], game_state["difficulty"], game_state["width"],
+             game_state["height"], game_state["mines"], json.dumps(grid),
+             game_state["timestamp"], game_state["time_elapsed"], game_state.get("progress"),
+             grid_bits)
+        )
+
+    def split_grid(self, grid):
+        """(grid without its bitsets, the bitsets as raw bytes) for format 2 grids, else (grid, None)"""
+        if not isinstance(grid, dict) or grid.get("format") != GRID_FORMAT_BITSET:
+            return grid, None
+        rest = {key: value for key, value in grid.items() if key not in GRID_BITSETS}
+        return rest, b"".join(base64.b64decode(grid[name]) for name in GRID_BITSETS)
+
+    def join_grid(self, grid, grid_bits):
+        if grid_bits is None:
+            return grid
+        size = len(grid_bits) // len(GRID_BITSETS)
+        for position, name in enumerate(GRID_BITSETS):
+            grid[name] = base64.b64encode(grid_bits[position * size:(position + 1) * size]).decode("ascii")
+        return grid
+
+    def insert_score(self, score_data):
+        self.connection.execute(
+            "INSERT INTO scores (grid_id, player, score, time, timestamp, difficulty, moves) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (score_data["grid_id"], score_data["player"], score_data["score"],
+             score_data["time"], score_data["timestamp"], score_data["difficulty"],
+             json.dumps(score_data["moves"]) if "moves" in score_data else None)
+        )
+
+    @metrics.timed("save.save_game")
+    def save_game(self, difficulty, board, time_elapsed, moves=None):
+        grid_id, game_state, grid_info = self.build_game_state(difficulty, board, time_elapsed, moves)
+        with self.connection:
+            self.insert_grid(grid_id, grid_info)
+            self.insert_game(game_state)
+        return grid_id
+
+    @metrics.timed("save.load_games")
+    def load_games(self):
+        rows = self.connection.execute("SELECT * FROM games ORDER BY id").fetchall()
+        return [self.game_from_row(row) for row in rows]
+
+    def game_from_row(self, row):
+        game_state = dict(row)
+        del game_state["id"]
+        game_state["grid"] = self.join_grid(json.loads(game_state["grid"]), game_state.pop("grid_bits"))
+        if game_state["progress"] is None:
+            del game_state["progress"]
+        return game_state
+
+    def get_game(self, game_id):
+        row = self.connection.execute("SELECT * FROM games WHERE id = ?", (game_id,)).fetchone()
+        return self.game_from_row(row) if row else None
+
+    def page_conditions(self, difficulty, since, date_column):
+        conditions, params = [], []
+        if difficulty:
+            conditions.append("difficulty = ?")
+            params.append(difficulty)
+        if since:
+            conditions.append(f"{date_column} >= ?")
+            params.append(since)
+        return conditions, params
+
+    def select_page(self, table, conditions, params, offset, limit, order, columns="*"):
+        where = " AND ".join(conditions) or "1"
+        total = self.connection.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params).fetchone()[0]
+        rows = self.connection.execute(
+            f"SELECT {columns} FROM {table} WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+        return rows, total
+
+    @metrics.timed("save.get_games_page")
+    def get_games_page(self, offset, limit, difficulty=None, since=None, newest_first=True):
+        conditions, params = self.page_conditions(difficulty, since, "timestamp")
+        # The grid column is left in the database until a game is picked
+        rows, total = self.select_page("games", conditions, params, offset, limit,
+                                       "id DESC" if newest_first else "id",
+                                       "id, grid_id, difficulty, width, height, timestamp, time_elapsed, progress")
+        return [dict(row) for row in rows], total
+
+    def get_scored_grids_page(self, offset, limit, difficulty=None, since=None, newest_first=True):
+        conditions, params = self.page_conditions(difficulty, since, "created_at")
+        conditions.append("grid_id IN (SELECT grid_id FROM scores)")
+        rows, total = self.select_page("grids", conditions, params, offset, limit,
+                                       "rowid DESC" if newest_first else "rowid")
+        return [(row["grid_id"], self.grid_from_row(row)) for row in rows], total
+
+    @metrics.timed("save.save_score")
+    def save_score(self, difficulty, player_name, score, time_elapsed, grid_id, moves=None):
+        score_data = self.build_score(difficulty, player_name, score, time_elapsed, grid_id, moves)
+        with self.connection:
+            self.insert_score(score_data)
+
+    @metrics.timed("save.get_scores")
+    def get_scores(self, difficulty=None, grid_id=None):
+        columns = "player, score, time, timestamp, difficulty, grid_id, moves"
+        if grid_id:
+            rows = self.connection.execute(
+                f"SELECT {columns} FROM scores WHERE grid_id = ? ORDER BY score DESC, time, id",
+                (grid_id,)
+            ).fetchall()
+        elif difficulty:
+            rows = self.connection.execute(
+                f"SELECT {columns} FROM scores WHERE difficulty = ? ORDER BY score DESC, time, id",
+                (difficulty,)
+            ).fetchall()
+        else:
+            return []
+        return [self.score_from_row(row) for row in rows]
+
+    @metrics.timed("save.get_top_scores")
+    def get_top_scores(self, difficulty=None, grid_id=None, limit=LEADERBOARD_SIZE):
+        # The (grid_id | difficulty, score DESC, time) indexes hand these over in order
+        columns = "player, score, time, timestamp, difficulty, grid_id"
+        if grid_id:
+            rows = self.connection.execute(
+                f"SELECT {columns}, moves FROM scores WHERE grid_id = ? ORDER BY score DESC, time, id LIMIT ?",
+                (grid_id, limit)
+            ).fetchall()
+            return [self.score_from_row(row) for row in rows]
+        elif difficulty:
+            # Like the JSON leaderboards: no move logs, at most LEADERBOARD_SIZE
+            rows = self.connection.execute(
+                f"SELECT {columns} FROM scores WHERE difficulty = ? ORDER BY score DESC, time, id LIMIT ?",
+                (difficulty, min(limit, LEADERBOARD_SIZE))
+            ).fetchall()
+            return [dict(row) for row in rows]
+        return []
+
+    def score_from_row(self, row):
+        score_data = dict(row)
+        if score_data["moves"] is None:
+            del score_data["moves"]
+        else:
+            score_data["moves"] = json.loads(score_data["moves"])
+        return score_data
+
+    def grid_from_row(self, row):
+        grid_info = dict(row)
+        del grid_info["grid_id"]
+        grid_info["mine_positions"] = json.loads(grid_info["mine_positions"] or "null")
+        if grid_info["mine_positions"] is None:
+            del grid_info["mine_positions"]
+        if grid_info["seed"] is None:
+            del grid_info["seed"]
+        grid_info["first_cell"] = json.loads(grid_info["first_cell"])
+        return grid_info
+
+    def get_grid_info(self, grid_id):
+        row = self.connection.execute(
+            "SELECT * FROM grids WHERE grid_id = ?", (grid_id,)
+        ).fetchone()
+        return self.grid_from_row(row) if row else None
+
+    def get_all_grids(self):
+        rows = self.connection.execute("SELECT * FROM grids ORDER BY created_at").fetchall()
+        return {row["grid_id"]: self.grid_from_row(row) for row in rows}
+
+    def close(self):
+        self.connection.close()
+
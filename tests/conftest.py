@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The game modules import each other flat, as they do when run from src/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
@@ -0,0 +1,52 @@
+import random
+
+from board import CHORD, FLAG, REVEAL, Board
+
+
+def random_game(width, height, mines, seed, steps=60):
+    """(seed, first_cell, moves) of a random game played on a Board, losses included.
+
+    Reveals mostly pick safe cells so games get far; flags land next to numbers, some
+    of them wrong, and chords are tried on revealed numbers.
+    """
+    rng = random.Random(seed)
+    board = Board(width, height, mines)
+    first_cell = (rng.randrange(width), rng.randrange(height))
+    layout_seed = rng.getrandbits(63)
+    board.place_mines(*first_cell, seed=layout_seed)
+    board.first_move = False
+    moves = [(*first_cell, REVEAL)]
+    board.reveal_cell(*first_cell)
+
+    for _ in range(steps):
+        if board.game_over:
+            break
+        cells = [(x, y) for x in range(width) for y in range(height)]
+        hidden = [(x, y) for x, y in cells
+                  if not board.grid[x][y].is_revealed and not board.grid[x][y].is_flagged]
+        numbers = [(x, y) for x, y in cells
+                   if board.grid[x][y].is_revealed and board.grid[x][y].adjacent_mines]
+        roll = rng.random()
+        if roll < 0.45 or not numbers:
+            safe = [cell for cell in hidden if not board.grid[cell[0]][cell[1]].is_mine]
+            # Now and then a mine, so losing games are covered too
+            move = (*rng.choice(safe if safe and rng.random() > 0.03 else hidden), REVEAL)
+        elif roll < 0.8:
+            x, y = rng.choice(numbers)
+            around = [(nx, ny) for nx in range(max(0, x - 1), min(width, x + 2))
+                      for ny in range(max(0, y - 1), min(height, y + 2))
+                      if not board.grid[nx][ny].is_revealed]
+            if not around:
+                continue
+            move = (*rng.choice(around), FLAG)
+        else:
+            move = (*rng.choice(numbers), CHORD)
+        moves.append(move)
+        x, y, action = move
+        if action == CHORD:
+            board.chord(x, y)
+        elif action == FLAG:
+            board.toggle_flag(x, y)
+        else:
+            board.reveal_cell(x, y)
+    return layout_seed, first_cell, moves
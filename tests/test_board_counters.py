@@ -0,0 +1,47 @@
+from board import CHORD, FLAG, Board
+
+from moves import random_game
+
+
+def full_count(board):
+    """(hidden safe cells, correct flags, wrong flags) by scanning every cell"""
+    cells = [cell for column in board.grid for cell in column]
+    return (sum(not cell.is_mine and not cell.is_revealed for cell in cells),
+            sum(cell.is_mine and cell.is_flagged for cell in cells),
+            sum(not cell.is_mine and cell.is_flagged for cell in cells))
+
+
+def test_counters_match_a_full_recount_after_every_move():
+    for game in range(40):
+        seed, first_cell, moves = random_game(16, 16, 40, game)
+        board = Board(16, 16, 40)
+        board.place_mines(*first_cell, seed=seed)
+        board.first_move = False
+        for x, y, action in moves:
+            if action == CHORD:
+                board.chord(x, y)
+            elif action == FLAG:
+                board.toggle_flag(x, y)
+            else:
+                board.reveal_cell(x, y)
+            assert (board.hidden_safe_cells, board.correct_flags, board.wrong_flags) == full_count(board)
+
+            hidden_safe, correct_flags, _ = full_count(board)
+            won = hidden_safe == 0 and correct_flags == board.mines
+            assert board.check_win() == won
+            revealed_safe = 16 * 16 - board.mines - hidden_safe
+            assert board.get_completion_percentage() == (revealed_safe + correct_flags) / (16 * 16) * 100
+
+
+def test_winning_move_is_detected():
+    board = Board(9, 9, 10)
+    board.reveal_cell(4, 4)
+    for column in board.grid:
+        for cell in column:
+            if cell.is_mine:
+                board.toggle_flag(cell.x, cell.y)
+            else:
+                board.reveal_cell(cell.x, cell.y)
+    assert board.hidden_safe_cells == 0 and board.correct_flags == 10
+    assert board.check_win() and board.won
+    assert board.get_completion_percentage() == 100
@@ -0,0 +1,29 @@
+from board import Board
+from chunked_board import ChunkedBoard
+from numpy_board import NumpyBoard
+from replay import rebuild_board
+
+from moves import random_game
+
+ENGINES = [Board, NumpyBoard, ChunkedBoard]
+
+
+def state(board):
+    return (board.cell_flags("is_revealed"), board.cell_flags("is_flagged"),
+            board.hidden_safe_cells, board.correct_flags, board.wrong_flags,
+            board.game_over, board.check_win(), board.get_completion_percentage())
+
+
+def test_engines_agree_on_the_same_moves():
+    for game in range(60):
+        # Non-square and larger than a chunk, so chunk edges are crossed
+        seed, first_cell, moves = random_game(40, 23, 90, game)
+        boards = [rebuild_board(40, 23, 90, seed, first_cell, moves, engine) for engine in ENGINES]
+        states = [state(board) for board in boards]
+        assert states[1] == states[0]
+        assert states[2] == states[0]
+
+        for board in boards:
+            board.reset_with_same_first_move()
+        assert state(boards[1]) == state(boards[0])
+        assert state(boards[2]) == state(boards[0])
@@ -0,0 +1,68 @@
+import json
+import random
+
+from save_manager import LEADERBOARD_SIZE, SaveManager, leaderboard_entry, score_rank
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def full_sort(scores, difficulty):
+    ranked = sorted((score for score in scores if score["difficulty"] == difficulty), key=score_rank)
+    return [leaderboard_entry(score) for score in ranked[:LEADERBOARD_SIZE]]
+
+
+def all_scores(save_manager):
+    return [score for grid_scores in save_manager.read_data()["scores"].values() for score in grid_scores]
+
+
+def save_random_scores(save_manager, rng, count):
+    for _ in range(count):
+        # Scores repeat, times do not, so every ranking is unambiguous
+        save_manager.save_score(rng.choice(DIFFICULTIES), "tester", rng.choice([25.0, 50.0, 100.0]),
+                                rng.random() * 100, f"grid-{rng.randrange(8)}")
+
+
+def test_leaderboards_match_a_full_sort(tmp_path):
+    save_file = str(tmp_path / "saves.json")
+    save_manager = SaveManager(save_file)
+    save_random_scores(save_manager, random.Random(3), 60)
+
+    # Read back from disk, where the leaderboards are persisted
+    fresh = SaveManager(save_file)
+    scores = all_scores(fresh)
+    for difficulty in DIFFICULTIES:
+        assert fresh.get_top_scores(difficulty=difficulty) == full_sort(scores, difficulty)
+    for grid_id in {score["grid_id"] for score in scores}:
+        expected = sorted((score for score in scores if score["grid_id"] == grid_id), key=score_rank)
+        assert fresh.get_top_scores(grid_id=grid_id, limit=5) == expected[:5]
+
+
+def test_leaderboards_are_built_for_old_save_files(tmp_path):
+    save_file = str(tmp_path / "saves.json")
+    save_manager = SaveManager(save_file)
+    save_random_scores(save_manager, random.Random(4), 30)
+    with open(save_file) as f:
+        data = json.load(f)
+    del data["leaderboards"]
+    with open(save_file, 'w') as f:
+        json.dump(data, f)
+
+    fresh = SaveManager(save_file)
+    scores = all_scores(fresh)
+    for difficulty in DIFFICULTIES:
+        assert fresh.get_top_scores(difficulty=difficulty) == full_sort(scores, difficulty)
+
+
+def test_incremental_inserts_match_a_full_sort(tmp_path):
+    save_manager = SaveManager(str(tmp_path / "saves.json"))
+    data = {"scores": {}}
+    rng = random.Random(5)
+    scores = []
+    for _ in range(2000):
+        score_data = {"difficulty": rng.choice(DIFFICULTIES), "player": "tester",
+                      "score": rng.choice([10.0, 50.0, 90.0, 100.0]), "time": rng.random(),
+                      "grid_id": f"grid-{rng.randrange(50)}", "moves": []}
+        save_manager.add_score(data, score_data)
+        scores.append(score_data)
+    for difficulty in DIFFICULTIES:
+        assert save_manager.select_top_scores(data, difficulty=difficulty) == full_sort(scores, difficulty)
@@ -0,0 +1,32 @@
+from board import Board
+from no_guess import NoGuessPool, solve_by_logic
+from solver import Solver
+
+SIZE = (9, 9, 10)
+
+
+def test_refilled_pool_serves_every_first_click(tmp_path):
+    pool = NoGuessPool(str(tmp_path / "pool.json"), copies=1, workers=1)
+    pool.refill({"Easy": SIZE})
+    assert pool.missing("Easy", *SIZE) == []
+
+    solver = Solver()
+    width, height, mines = SIZE
+    for x in range(width):
+        for y in range(height):
+            board = Board(*SIZE)
+            layout = pool.take("Easy", *SIZE, x, y)
+            assert layout is not None
+            board.place_mines(*layout["first_cell"], seed=layout["seed"])
+            board.first_move = False
+            board.reveal_cell(x, y)
+            assert solve_by_logic(board, solver)
+            # Put it back so every cell is checked against the same pool
+            pool.add("Easy", *SIZE, [layout])
+
+
+def test_pool_miss_is_reported(tmp_path):
+    pool = NoGuessPool(str(tmp_path / "pool.json"), workers=1)
+    board = Board(*SIZE)
+    assert pool.place_mines("Easy", board, 4, 4) is False
+    assert not board.first_move
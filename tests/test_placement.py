@@ -0,0 +1,39 @@
+from board import Board, sample_mine_indices
+from game_manager import GameManager
+from save_manager import SaveManager
+
+
+def test_same_seed_and_first_click_give_the_same_layout():
+    for seed in range(50):
+        first = Board(30, 16, 99)
+        first.place_mines(7, 3, seed=seed)
+        second = Board(30, 16, 99)
+        second.place_mines(7, 3, seed=seed)
+        assert first.mine_indices() == second.mine_indices()
+        assert sorted(first.mine_indices()) == sorted(sample_mine_indices(30, 16, 7, 3, 99, seed))
+
+
+def test_layout_is_sound():
+    for seed in range(50):
+        indices = sample_mine_indices(30, 16, 0, 15, 99, seed)
+        assert len(set(indices)) == 99
+        assert all(0 <= index < 30 * 16 for index in indices)
+        # Nothing in the 3x3 area around the first click, clipped at the corner
+        assert not {0 * 16 + 14, 0 * 16 + 15, 1 * 16 + 14, 1 * 16 + 15} & set(indices)
+    assert sample_mine_indices(30, 16, 7, 3, 99, 1) != sample_mine_indices(30, 16, 7, 3, 99, 2)
+
+
+def test_restart_keeps_the_layout(tmp_path):
+    game = GameManager("Medium", SaveManager(str(tmp_path / "saves.json")))
+    game.make_move(8, 8, is_flag=True)
+    game.make_move(3, 4)
+    layout = game.board.mine_indices()
+    seed, first_cell = game.board.seed, game.board.first_cell
+
+    game.restart_game()
+    board = game.board
+    assert board.mine_indices() == layout
+    assert (board.seed, board.first_cell) == (seed, first_cell)
+    assert board.grid[3][4].is_revealed and not board.grid[8][8].is_flagged
+    assert game.moves == [(3, 4, 0)]
+    assert GameManager.save_writer.flush() == []
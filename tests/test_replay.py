@@ -0,0 +1,44 @@
+from game_manager import GameManager
+from replay import audit_score
+from save_manager import SaveManager
+
+
+def cell_states(board):
+    return [(cell.is_revealed, cell.is_flagged) for column in board.grid for cell in column]
+
+
+def save_and_reload(game, save_manager):
+    grid_id = game.save_game(1.0).result()
+    saved = [g for g in save_manager.load_games() if g["grid_id"] == grid_id][-1]
+    return GameManager.from_saved(saved, save_manager)
+
+
+def assert_round_trip(game, save_manager):
+    loaded = save_and_reload(game, save_manager)
+    assert cell_states(loaded.board) == cell_states(game.board)
+
+    game.save_score("tester").result()
+    grid_id = game.pending_save.result()
+    score = save_manager.get_scores(grid_id=grid_id)[-1]
+    assert audit_score(save_manager.get_grid_info(grid_id), score) is True
+
+
+def test_flag_before_first_reveal_replays(tmp_path):
+    save_manager = SaveManager(str(tmp_path / "saves.json"))
+    for _ in range(20):
+        game = GameManager("Medium", save_manager)
+        # (1, 1) is inside the opening of (0, 0): the flag must keep it closed
+        game.make_move(1, 1, is_flag=True)
+        game.make_move(0, 0)
+        assert game.board.grid[1][1].is_flagged
+        assert_round_trip(game, save_manager)
+
+
+def test_restarted_game_replays(tmp_path):
+    save_manager = SaveManager(str(tmp_path / "saves.json"))
+    game = GameManager("Medium", save_manager)
+    game.make_move(8, 8)
+    game.restart_game()
+    game.make_move(0, 0, is_flag=True)
+    game.make_move(15, 15)
+    assert_round_trip(game, save_manager)
@@ -0,0 +1,38 @@
+from board import Board
+from save_manager import SaveManager
+
+
+def save_games(save_manager, count):
+    for _ in range(count):
+        board = Board(9, 9, 10)
+        board.reveal_cell(4, 4)
+        save_manager.save_game("Easy", board, 1.0, [(4, 4, 0)])
+
+
+def test_index_appends_and_matches_a_rebuild(tmp_path):
+    save_file = str(tmp_path / "saves.json")
+    save_manager = SaveManager(save_file)
+    save_games(save_manager, 3)
+    save_manager.save_score("Easy", "tester", 100, 1.0, save_manager.load_games()[0]["grid_id"])
+    save_games(save_manager, 2)
+
+    # A fresh manager trusts the index on disk instead of rebuilding it
+    fresh = SaveManager(save_file)
+    summaries, total = fresh.get_games_page(0, 10, newest_first=False)
+    assert total == 5
+    assert [summary["id"] for summary in summaries] == list(range(5))
+    games = fresh.load_games()
+    assert summaries == [fresh.game_summary(game_id, game) for game_id, game in enumerate(games)]
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    save_file = str(tmp_path / "saves.json")
+    save_manager = SaveManager(save_file)
+    save_games(save_manager, 2)
+    # Another writer adds a game without touching the index
+    other = SaveManager(save_file)
+    other.index_file = str(tmp_path / "elsewhere.index")
+    save_games(other, 1)
+
+    fresh = SaveManager(save_file)
+    assert fresh.get_games_page(0, 10)[1] == 3
@@ -0,0 +1,29 @@
+from game_manager import GameManager
+from save_manager import SaveManager
+from save_writer import SaveWriter
+
+
+def fail():
+    raise OSError("disk full")
+
+
+def test_flush_reports_failed_writes_once():
+    writer = SaveWriter()
+    writer.submit(lambda: None)
+    future = writer.submit(fail)
+    failures = writer.flush()
+    assert [str(error) for error in failures] == ["disk full"]
+    assert future.exception() is failures[0]
+    assert writer.flush() == []
+
+
+def test_lost_game_and_score_are_reported(tmp_path, monkeypatch):
+    save_manager = SaveManager(str(tmp_path / "saves.json"))
+    GameManager.save_writer.flush()
+    monkeypatch.setattr(save_manager, "save_game", lambda *args: fail())
+    monkeypatch.setattr(save_manager, "save_score", lambda *args: fail())
+    game = GameManager("Easy", save_manager)
+    game.make_move(4, 4)
+    game.save_score("tester")
+    # The save fails, and the score fails with it as it needs the save's grid ID
+    assert len(GameManager.save_writer.flush()) == 2
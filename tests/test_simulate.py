@@ -0,0 +1,18 @@
+import random
+
+from board import Board
+from simulate import play_game
+
+
+def clearing_strategy(board, rng, solver):
+    """Open every safe cell without flagging, reading the layout"""
+    return [(x, y, False) for x in range(board.width) for y in range(board.height)
+            if not board.grid[x][y].is_mine and not board.grid[x][y].is_revealed]
+
+
+def test_clearing_the_board_without_flags_wins():
+    board = Board(9, 9, 10)
+    result = play_game(board, clearing_strategy, random.Random(1), None)
+    assert result["won"]
+    assert result["completion"] == 100
+
@@ -0,0 +1,91 @@
+import random
+from itertools import combinations
+
+from board import Board
+from solver import Solver
+
+
+def random_state(rng):
+    board = Board(9, 9, 10)
+    board.place_mines(rng.randrange(9), rng.randrange(9), seed=rng.randrange(2 ** 32))
+    board.first_move = False
+    hidden = [(x, y) for x in range(9) for y in range(9) if not board.grid[x][y].is_mine]
+    for x, y in rng.sample(hidden, rng.randrange(5, 30)):
+        board.reveal_cell(x, y)
+    return board
+
+
+def assert_sound(board, result):
+    for x, y in result.safe_cells:
+        assert not board.grid[x][y].is_mine
+    for x, y in result.mine_cells:
+        assert board.grid[x][y].is_mine
+
+
+def test_fallback_claims_are_sound():
+    rng = random.Random(12)
+    solvers = [Solver(max_component_size=2), Solver(max_search_nodes=4)]
+    for _ in range(1500):
+        board = random_state(rng)
+        for solver in solvers:
+            assert_sound(board, solver.solve(board))
+
+
+def test_exact_claims_are_sound():
+    rng = random.Random(34)
+    solver = Solver()
+    for _ in range(300):
+        board = random_state(rng)
+        assert_sound(board, solver.solve(board))
+
+
+def hidden_cells(board):
+    return {(x, y) for x in range(board.width) for y in range(board.height)
+            if not board.grid[x][y].is_revealed and not board.grid[x][y].is_flagged}
+
+
+def brute_force(board):
+    """Mine probability of every hidden cell over all layouts consistent with the view"""
+    hidden = sorted(hidden_cells(board))
+    numbers = [(x, y, board.grid[x][y].adjacent_mines)
+               for x in range(board.width) for y in range(board.height) if board.grid[x][y].is_revealed]
+    layouts = 0
+    with_mine = dict.fromkeys(hidden, 0)
+    for mines in combinations(hidden, board.mines):
+        mine_set = set(mines)
+        if all(sum((nx, ny) in mine_set for nx in range(x - 1, x + 2) for ny in range(y - 1, y + 2)) == value
+               for x, y, value in numbers):
+            layouts += 1
+            for cell in mines:
+                with_mine[cell] += 1
+    return {cell: count / layouts for cell, count in with_mine.items()}
+
+
+def test_exact_path_covers_every_hidden_cell():
+    rng = random.Random(56)
+    solver = Solver()
+    for _ in range(300):
+        board = random_state(rng)
+        result = solver.solve(board)
+        assert set(result.probabilities) == hidden_cells(board)
+
+
+def test_exact_probabilities_match_brute_force():
+    rng = random.Random(78)
+    solver = Solver()
+    for _ in range(40):
+        board = Board(5, 5, 4)
+        board.place_mines(rng.randrange(5), rng.randrange(5), seed=rng.randrange(2 ** 32))
+        board.first_move = False
+        safe = [(x, y) for x in range(5) for y in range(5) if not board.grid[x][y].is_mine]
+        for x, y in rng.sample(safe, rng.randrange(2, 8)):
+            board.reveal_cell(x, y)
+        expected = brute_force(board)
+        result = solver.solve(board)
+        assert set(result.probabilities) == set(expected)
+        for cell, probability in expected.items():
+            assert abs(result.probabilities[cell] - probability) < 1e-9
+            if probability == 0:
+                assert cell in result.safe_cells
+            elif probability == 1:
+                assert cell in result.mine_cells
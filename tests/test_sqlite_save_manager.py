@@ -0,0 +1,34 @@
+from board import Board
+from sqlite_save_manager import SqliteSaveManager
+
+
+def test_inherited_cache_stats(tmp_path):
+    save_manager = SqliteSaveManager(str(tmp_path / "saves.db"), json_file=None)
+    assert save_manager.cache_stats() == {"hits": 0, "misses": 0}
+
+
+def test_game_round_trip(tmp_path):
+    save_manager = SqliteSaveManager(str(tmp_path / "saves.db"), json_file=None)
+    board = Board(9, 9, 10)
+    board.reveal_cell(4, 4)
+    grid_id = save_manager.save_game("Easy", board, 1.0, [(4, 4, 0)])
+    games = save_manager.load_games()
+    assert [game["grid_id"] for game in games] == [grid_id]
+
+
+def test_bitset_grid_is_stored_as_bytes(tmp_path):
+    save_manager = SqliteSaveManager(str(tmp_path / "saves.db"), json_file=None)
+    board = Board(30, 16, 99)
+    board.reveal_cell(4, 4)
+    board.toggle_flag(0, 0)
+    # Without a move log the grid is saved as bitsets
+    save_manager.save_game("Hard", board, 1.0)
+
+    row = save_manager.connection.execute("SELECT grid, grid_bits FROM games").fetchone()
+    assert isinstance(row["grid_bits"], bytes) and len(row["grid_bits"]) == 3 * 60
+    assert "mines" not in row["grid"]
+
+    loaded = Board(30, 16, 99)
+    save_manager.restore_grid(loaded, save_manager.load_games()[0]["grid"])
+    for name in ("is_mine", "is_revealed", "is_flagged"):
+        assert loaded.cell_flags(name) == board.cell_flags(name)